@@ -1282,6 +1282,18 @@ Text to convert:
 
         return markdown_content
     
+    def _read_input(self, input_path: Path) -> str:
+        """Read an input file as text, extracting plain text from RTF files."""
+        with open(input_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        if input_path.suffix.lower() == '.rtf':
+            content = rtf_to_text(content)
+            if self.debug:
+                print(f"Extracted text from RTF: {len(content)} characters")
+
+        return content
+
     def convert_with_ai(self, input_path: str, output_path: Optional[str] = None) -> bool:
         """Convert document using AI analysis."""
         # Resolve any aliases or symlinks
@@ -1297,22 +1309,14 @@ Text to convert:
             if self.show_progress:
                 print(f"📄 Processing: {input_path.name}", flush=True)
 
-            # Read the input file based on format
-            if input_path.suffix.lower() == '.rtf':
-                # Read RTF file and extract plain text
-                try:
-                    with open(input_path, 'r', encoding='utf-8') as f:
-                        rtf_content = f.read()
-                    text_content = rtf_to_text(rtf_content)
-                    if self.debug:
-                        print(f"Extracted text from RTF: {len(text_content)} characters")
-                except Exception as e:
-                    print(f"❌ Error reading RTF file: {e}")
-                    return False
-            else:
-                # Read regular text files
-                with open(input_path, 'r', encoding='utf-8') as f:
-                    text_content = f.read()
+            # Read the input file, extracting plain text from RTF
+            try:
+                text_content = self._read_input(input_path)
+            except Exception as e:
+                if input_path.suffix.lower() != '.rtf':
+                    raise
+                print(f"❌ Error reading RTF file: {e}")
+                return False
             
             if not text_content.strip():
                 print(f"❌ Error: Input file is empty: {input_path}")
@@ -0,0 +1,72 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Compiled Simple Text to Markdown Conversion
+Optional accelerator for TextToMarkdownConverter._simple_text_to_markdown.
+text_to_markdown.py uses the pure-Python version when this module is not built.
+
+Build in place with:
+    cythonize -i fast_md.pyx
+"""
+
+
+cdef inline bint _is_numbered(str s):
+    """Digit with '. ' inside the first four characters, as in text_to_markdown."""
+    cdef Py_ssize_t n = len(s)
+    if n < 3 or not s[0].isdigit():
+        return False
+    if s[1] == u'.' and s[2] == u' ':
+        return True
+    return n >= 4 and s[2] == u'.' and s[3] == u' '
+
+
+cpdef str simple_text_to_markdown(str text_content):
+    """Simple fallback conversion from text to markdown."""
+    cdef list parts = []
+    cdef bint in_list = False
+    cdef str line, stripped
+    cdef Py_UCS4 first
+    
+    # Every output line gets a trailing newline; the final one is dropped on return
+    for line in text_content.split(u'\n'):
+        stripped = line.strip()
+        
+        # Skip empty lines
+        if not stripped:
+            parts.append(u'\n')
+            in_list = False
+            continue
+        
+        first = stripped[0]
+        
+        # Detect potential headings (lines that are title-cased or all caps)
+        if (first not in u'-*•123' and 
+            not first.islower() and 
+            len(stripped) < 100 and 
+            (stripped.istitle() or stripped.isupper())):
+            parts.append(u'\n## ')
+            parts.append(stripped)
+            parts.append(u'\n\n')
+            in_list = False
+            continue
+        
+        # Detect list items
+        if first in u'-*•':
+            # Bullet list
+            parts.append(u'- ')
+            parts.append(stripped[1:].lstrip())
+            parts.append(u'\n')
+            in_list = True
+        elif _is_numbered(stripped):
+            # Numbered list
+            parts.append(stripped)
+            parts.append(u'\n')
+            in_list = True
+        else:
+            # Regular paragraph
+            if in_list:
+                parts.append(u'\n')
+            parts.append(line)
+            parts.append(u'\n')
+            in_list = False
+    
+    return u''.join(parts)[:-1]
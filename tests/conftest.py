@@ -4,11 +4,12 @@ Pytest configuration and shared fixtures for the Word Formatter test suite.
 
 import os
 import sys
-import tempfile
+import subprocess
 import shutil
 from pathlib import Path
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
-from typing import Generator, Dict, Any
+from typing import Dict, Any
 
 import pytest
 from docx import Document
@@ -23,6 +24,28 @@ sys.path.insert(0, str(PROJECT_ROOT))
 # Import modules after adding to path
 from document_converter import DocumentConverter, StyleExtractor
 from document_converter_ai import AIDocumentConverter
+from utils.mock_helpers import ComprehensiveMockManager
+
+
+def pytest_addoption(parser):
+    """Register the --slow option for opting into slow tests."""
+    parser.addoption(
+        "--slow",
+        action="store_true",
+        default=False,
+        help="Run tests marked as slow (real docx I/O, large files, performance)"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip slow tests unless --slow is given or selected via -m."""
+    if config.getoption("--slow") or "slow" in (config.getoption("-m") or ""):
+        return
+    
+    skip_slow = pytest.mark.skip(reason="slow test; use --slow to run")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
 
 
 @pytest.fixture(scope="session")
@@ -32,11 +55,13 @@ def test_data_dir() -> Path:
 
 
 @pytest.fixture(scope="session")
-def reference_doc_path(test_data_dir: Path) -> Path:
-    """Create and return a test reference document."""
-    ref_path = test_data_dir / "test_reference.docx"
-    if ref_path.exists():
-        return ref_path
+def reference_doc_path(tmp_path_factory) -> Path:
+    """Create and return a test reference document.
+    
+    Built under a per-session temp directory so parallel (xdist) workers
+    never race on the same file.
+    """
+    ref_path = tmp_path_factory.mktemp("reference") / "test_reference.docx"
     
     # Create a simple reference document for testing
     doc = Document()
@@ -93,24 +118,20 @@ def reference_doc_path(test_data_dir: Path) -> Path:
     section.left_margin = Pt(72)   # 1 inch
     section.right_margin = Pt(72)  # 1 inch
     
-    # Create directory if it doesn't exist
-    test_data_dir.mkdir(parents=True, exist_ok=True)
     doc.save(str(ref_path))
     return ref_path
 
 
 @pytest.fixture
-def temp_dir() -> Generator[Path, None, None]:
-    """Create a temporary directory for test files."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+def temp_dir(tmp_path: Path) -> Path:
+    """Return a unique per-test temporary directory."""
+    return tmp_path
 
 
-@pytest.fixture
-def sample_text_file(temp_dir: Path) -> Path:
-    """Create a sample text file for testing."""
-    text_file = temp_dir / "sample.txt"
-    content = """Test Document
+@pytest.fixture(scope="session")
+def _sample_text_bytes() -> bytes:
+    """Content of the sample text file, encoded once per session."""
+    return """Test Document
 
 Chapter 1: Introduction
 
@@ -133,16 +154,13 @@ And here's a numbered list:
 Chapter 2: Advanced Topics
 
 More content here with some code snippets and technical terms.
-"""
-    text_file.write_text(content, encoding='utf-8')
-    return text_file
+""".encode('utf-8')
 
 
-@pytest.fixture
-def sample_markdown_file(temp_dir: Path) -> Path:
-    """Create a sample markdown file for testing."""
-    md_file = temp_dir / "sample.md"
-    content = """# Test Document
+@pytest.fixture(scope="session")
+def _sample_markdown_bytes() -> bytes:
+    """Content of the sample markdown file, encoded once per session."""
+    return """# Test Document
 
 ## Chapter 1: Introduction
 
@@ -170,53 +188,37 @@ More content here with some `code snippets` and **technical terms**.
 |----------|----------|----------|
 | Data 1   | Data 2   | Data 3   |
 | Data 4   | Data 5   | Data 6   |
-"""
-    md_file.write_text(content, encoding='utf-8')
-    return md_file
+""".encode('utf-8')
 
 
-@pytest.fixture
-def sample_rtf_file(temp_dir: Path) -> Path:
-    """Create a sample RTF file for testing."""
-    rtf_file = temp_dir / "sample.rtf"
+@pytest.fixture(scope="session")
+def _sample_rtf_bytes() -> bytes:
+    """Content of the sample RTF file, encoded once per session."""
     # Simple RTF content
-    rtf_content = r"""{\rtf1\ansi\deff0 {\fonttbl {\f0 Times New Roman;}}
+    return rb"""{\rtf1\ansi\deff0 {\fonttbl {\f0 Times New Roman;}}
 \f0\fs24 Test Document\par
 \par
 This is a sample RTF document with some text.\par
 \par
 It has multiple paragraphs and should be processed correctly.\par
 }"""
-    rtf_file.write_text(rtf_content, encoding='utf-8')
-    return rtf_file
 
 
-@pytest.fixture
-def empty_text_file(temp_dir: Path) -> Path:
-    """Create an empty text file for testing edge cases."""
-    empty_file = temp_dir / "empty.txt"
-    empty_file.write_text("", encoding='utf-8')
-    return empty_file
-
-
-@pytest.fixture
-def large_text_file(temp_dir: Path) -> Path:
-    """Create a large text file for performance testing."""
-    large_file = temp_dir / "large.txt"
+@pytest.fixture(scope="session")
+def _large_text_bytes() -> bytes:
+    """Content of the large text file, built and encoded once per session."""
     content = "This is a test paragraph with some content. " * 500  # ~20KB per chapter
     chapters = []
     for i in range(10):  # Create ~200KB file
         chapters.append(f"Chapter {i+1}: Test Chapter\n\n{content}\n\n")
     
-    large_file.write_text('\n'.join(chapters), encoding='utf-8')
-    return large_file
+    return '\n'.join(chapters).encode('utf-8')
 
 
-@pytest.fixture
-def sanskrit_text_file(temp_dir: Path) -> Path:
-    """Create a text file with Sanskrit and non-English content."""
-    sanskrit_file = temp_dir / "sanskrit.txt"
-    content = """Test Document with Sanskrit
+@pytest.fixture(scope="session")
+def _sanskrit_text_bytes() -> bytes:
+    """Content of the Sanskrit/non-English text file, encoded once per session."""
+    return """Test Document with Sanskrit
 
 Introduction
 
@@ -229,18 +231,76 @@ Arabic: السلام عليكم
 Chinese: 你好世界
 
 Regular English text should not be italicized.
-"""
-    sanskrit_file.write_text(content, encoding='utf-8')
+""".encode('utf-8')
+
+
+@pytest.fixture
+def sample_text_file(tmp_path: Path, _sample_text_bytes: bytes) -> Path:
+    """Create a sample text file for testing."""
+    text_file = tmp_path / "sample.txt"
+    text_file.write_bytes(_sample_text_bytes)
+    return text_file
+
+
+@pytest.fixture
+def sample_markdown_file(tmp_path: Path, _sample_markdown_bytes: bytes) -> Path:
+    """Create a sample markdown file for testing."""
+    md_file = tmp_path / "sample.md"
+    md_file.write_bytes(_sample_markdown_bytes)
+    return md_file
+
+
+@pytest.fixture
+def sample_rtf_file(tmp_path: Path, _sample_rtf_bytes: bytes) -> Path:
+    """Create a sample RTF file for testing."""
+    rtf_file = tmp_path / "sample.rtf"
+    rtf_file.write_bytes(_sample_rtf_bytes)
+    return rtf_file
+
+
+@pytest.fixture
+def empty_text_file(tmp_path: Path) -> Path:
+    """Create an empty text file for testing edge cases."""
+    empty_file = tmp_path / "empty.txt"
+    empty_file.write_bytes(b"")
+    return empty_file
+
+
+@pytest.fixture
+def large_text_file(tmp_path: Path, _large_text_bytes: bytes) -> Path:
+    """Create a large text file for performance testing."""
+    large_file = tmp_path / "large.txt"
+    large_file.write_bytes(_large_text_bytes)
+    return large_file
+
+
+@pytest.fixture
+def sanskrit_text_file(tmp_path: Path, _sanskrit_text_bytes: bytes) -> Path:
+    """Create a text file with Sanskrit and non-English content."""
+    sanskrit_file = tmp_path / "sanskrit.txt"
+    sanskrit_file.write_bytes(_sanskrit_text_bytes)
     return sanskrit_file
 
 
+@pytest.fixture(scope="session")
+def _converter_mock() -> MagicMock:
+    """Spec'd DocumentConverter mock, built once per session."""
+    return MagicMock(spec=DocumentConverter)
+
+
 @pytest.fixture
-def mock_claude_success():
-    """Mock successful Claude CLI responses."""
-    def mock_run(cmd, **kwargs):
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = """# Test Document
+def converter_mock(_converter_mock: MagicMock):
+    """Provide the shared DocumentConverter mock, reset after each test."""
+    yield _converter_mock
+    _converter_mock.reset_mock(return_value=True, side_effect=True)
+
+
+@pytest.fixture(scope="session")
+def _claude_success_payload() -> Dict[str, Any]:
+    """Canned Claude CLI result for a successful conversion."""
+    return {
+        "returncode": 0,
+        "stdout": """# Test Document
 
 ## Chapter 1: Introduction
 
@@ -258,57 +318,70 @@ Here is a bulleted list:
 ## Chapter 2: Advanced Topics
 
 More content here with technical terms.
-"""
-        mock_result.stderr = ""
-        return mock_result
-    
-    with patch('subprocess.run', side_effect=mock_run):
-        yield
+""",
+        "stderr": "",
+    }
+
+
+@pytest.fixture(scope="session")
+def _claude_error_payload() -> Dict[str, Any]:
+    """Canned Claude CLI result for an API error."""
+    return {
+        "returncode": 1,
+        "stdout": "",
+        "stderr": "Claude API error: Rate limit exceeded",
+    }
+
+
+@pytest.fixture(scope="session")
+def _claude_incomplete_payload() -> Dict[str, Any]:
+    """Canned Claude CLI result that stops before the end of the document."""
+    return {
+        "returncode": 0,
+        "stdout": """# Test Document
+
+## Chapter 1: Introduction
+
+This is the first paragraph of our test document.
+
+Would you like me to continue with the rest of the document?""",
+        "stderr": "",
+    }
+
+
+@pytest.fixture
+def mock_claude_success(_claude_success_payload):
+    """Mock successful Claude CLI responses."""
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value = SimpleNamespace(**_claude_success_payload)
+        yield mock_run
+
+
+def _raise_timeout(cmd, **kwargs):
+    raise subprocess.TimeoutExpired(cmd, kwargs.get('timeout', 600))
 
 
 @pytest.fixture
 def mock_claude_timeout():
     """Mock Claude CLI timeout."""
-    def mock_run(cmd, **kwargs):
-        import subprocess
-        raise subprocess.TimeoutExpired(cmd, kwargs.get('timeout', 600))
-    
-    with patch('subprocess.run', side_effect=mock_run):
-        yield
+    with patch('subprocess.run', side_effect=_raise_timeout) as mock_run:
+        yield mock_run
 
 
 @pytest.fixture
-def mock_claude_error():
+def mock_claude_error(_claude_error_payload):
     """Mock Claude CLI error responses."""
-    def mock_run(cmd, **kwargs):
-        mock_result = MagicMock()
-        mock_result.returncode = 1
-        mock_result.stdout = ""
-        mock_result.stderr = "Claude API error: Rate limit exceeded"
-        return mock_result
-    
-    with patch('subprocess.run', side_effect=mock_run):
-        yield
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value = SimpleNamespace(**_claude_error_payload)
+        yield mock_run
 
 
 @pytest.fixture
-def mock_claude_incomplete():
+def mock_claude_incomplete(_claude_incomplete_payload):
     """Mock Claude returning incomplete response."""
-    def mock_run(cmd, **kwargs):
-        mock_result = MagicMock()
-        mock_result.returncode = 0
-        mock_result.stdout = """# Test Document
-
-## Chapter 1: Introduction
-
-This is the first paragraph of our test document.
-
-Would you like me to continue with the rest of the document?"""
-        mock_result.stderr = ""
-        return mock_result
-    
-    with patch('subprocess.run', side_effect=mock_run):
-        yield
+    with patch('subprocess.run') as mock_run:
+        mock_run.return_value = SimpleNamespace(**_claude_incomplete_payload)
+        yield mock_run
 
 
 @pytest.fixture
@@ -319,17 +392,63 @@ def mock_notifications():
         def selective_mock(cmd, **kwargs):
             if isinstance(cmd, list) and len(cmd) > 0:
                 if 'terminal-notifier' in cmd[0] or 'osascript' in cmd[0]:
-                    mock_result = MagicMock()
-                    mock_result.returncode = 0
-                    return mock_result
+                    return SimpleNamespace(returncode=0)
             # For non-notification calls, use the real subprocess.run
-            import subprocess
             return subprocess.run(cmd, **kwargs)
         
         mock_run.side_effect = selective_mock
         yield mock_run
 
 
+class _SubprocessDispatcher:
+    """Route a shared subprocess.run patch to the active mock manager.
+    
+    With no manager active, calls fall through to the real subprocess.run
+    captured when the patch was started.
+    """
+    
+    def __init__(self):
+        self.current = None
+        self.real_run = subprocess.run
+    
+    def __call__(self, cmd, *args, **kwargs):
+        if self.current is None:
+            return self.real_run(cmd, *args, **kwargs)
+        if args:
+            raise TypeError("mocked subprocess.run takes only cmd positionally")
+        return self.current.mock_subprocess_run(cmd, **kwargs)
+
+
+@pytest.fixture(scope="session")
+def _subprocess_dispatcher():
+    """Patch subprocess.run once, the first time a test asks for mock_manager.
+    
+    Starting and stopping the patch per test rebinds subprocess.run every
+    time; the patch stays in place for the rest of the session and is
+    undone when the session ends.
+    """
+    dispatcher = _SubprocessDispatcher()
+    with patch('subprocess.run', new=dispatcher):
+        yield dispatcher
+
+
+@pytest.fixture(scope="session")
+def _mock_manager() -> ComprehensiveMockManager:
+    """Comprehensive mock manager, built once per session."""
+    return ComprehensiveMockManager()
+
+
+@pytest.fixture
+def mock_manager(_mock_manager: ComprehensiveMockManager, _subprocess_dispatcher):
+    """Mock all subprocess calls with the shared manager for one test."""
+    _subprocess_dispatcher.current = _mock_manager
+    try:
+        yield _mock_manager
+    finally:
+        _subprocess_dispatcher.current = None
+        _mock_manager.reset_all()
+
+
 @pytest.fixture(autouse=True)
 def clean_environment():
     """Clean environment variables before each test."""
@@ -29,6 +29,7 @@ class TestRunner:
             str(self.test_dir / "unit"),
             "-v" if verbose else "",
             "-m", "unit",
+            "-p", "no:cacheprovider",  # Unit runs never need --lf/--ff state
             "--tb=short",
             "--durations=5"
         ]
@@ -89,6 +90,7 @@ class TestRunner:
             str(self.test_dir / "test_performance.py"),
             "-v" if verbose else "",
             "-m", "performance",
+            "--slow",
             "--tb=short",
             "--durations=10"
         ]
@@ -179,6 +181,7 @@ class TestRunner:
             str(self.test_dir),
             "-v" if verbose else "",
             "-m", "slow",
+            "--slow",
             "--tb=short",
             "--durations=10"
         ]
@@ -213,6 +216,7 @@ class TestRunner:
             "--cov-report=term-missing",
             "--cov-report=html:tests/coverage_html",
             "--cov-fail-under=75",
+            "--slow",
             "-x"  # Stop on first failure for faster feedback
         ]
         
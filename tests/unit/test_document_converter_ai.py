@@ -4,19 +4,91 @@ Tests AIDocumentConverter class and its AI-enhanced functionality.
 """
 
 import os
+import functools
 import pytest
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock, call
+from types import SimpleNamespace
 import subprocess
 
 from document_converter_ai import AIDocumentConverter
 
 
+pytestmark = pytest.mark.unit
+
+
+# Large inputs are built once per process rather than inside each test
+_LARGE_TEXT_50K = "x" * 50000
+_TEXT_6K = "x" * 6000
+_LARGE_CHUNKED = "Chapter 1\n\n" + ("Test paragraph. " * 100) + "\n\nChapter 2\n\n" + ("Another paragraph. " * 100)
+
+
+class _ClaudeRouter:
+    """subprocess.run side effect that answers Claude calls by model and everything else with one canned result."""
+    
+    SONNET_TIMEOUT = subprocess.TimeoutExpired(['claude'], 600)
+    HAIKU_OK = SimpleNamespace(returncode=0, stdout="# Converted with Haiku\n\nTest content", stderr="")
+    CHUNK_OK = SimpleNamespace(returncode=0, stdout="# Converted chunk\n\nContent here", stderr="")
+    NOTIFY_OK = SimpleNamespace(returncode=0)
+    FAILED = SimpleNamespace(returncode=1, stdout="", stderr="")
+    
+    def __init__(self, models, other):
+        self.models = models  # model name -> result, or exception to raise
+        self.other = other
+    
+    def __call__(self, cmd, **kwargs):
+        if '--model' not in cmd:
+            return self.other
+        response = self.models.get(cmd[cmd.index('--model') + 1], self.other)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+
+_HAIKU_FALLBACK_ROUTER = _ClaudeRouter(
+    {'sonnet': _ClaudeRouter.SONNET_TIMEOUT, 'haiku': _ClaudeRouter.HAIKU_OK},
+    _ClaudeRouter.FAILED,
+)
+_CHUNK_ROUTER = _ClaudeRouter(
+    dict.fromkeys(('sonnet', 'opus', 'haiku'), _ClaudeRouter.CHUNK_OK),
+    _ClaudeRouter.NOTIFY_OK,
+)
+
+
+# Analysis prompts built by ai_converter, shared by every test in the session
+_PROMPT_CACHE = {}
+
+
+def _hashable(value):
+    """Turn list arguments (such as TOC chapter lists) into tuples so they can key _PROMPT_CACHE."""
+    return tuple(value) if isinstance(value, list) else value
+
+
+@pytest.fixture
+def ai_converter(reference_doc_path):
+    """AIDocumentConverter whose analysis prompt builder is memoized across tests.
+    
+    The prompt depends only on the method's arguments, so prompts built in
+    one test are reused by the next.
+    """
+    converter = AIDocumentConverter(str(reference_doc_path))
+    build_prompt = converter._create_analysis_prompt
+    
+    @functools.wraps(build_prompt)
+    def cached_prompt(*args, **kwargs):
+        key = (tuple(map(_hashable, args)), tuple(sorted((k, _hashable(v)) for k, v in kwargs.items())))
+        if key not in _PROMPT_CACHE:
+            _PROMPT_CACHE[key] = build_prompt(*args, **kwargs)
+        return _PROMPT_CACHE[key]
+    
+    converter._create_analysis_prompt = cached_prompt
+    return converter
+
+
 class TestAIDocumentConverter:
     """Test cases for the AIDocumentConverter class."""
     
-    @pytest.mark.unit
     def test_ai_converter_initialization(self, reference_doc_path):
         """Test that AIDocumentConverter initializes correctly."""
         # Arrange & Act
@@ -32,7 +104,6 @@ class TestAIDocumentConverter:
         assert converter.timeout == 600  # Default value
         assert converter.enable_haiku_fallback == True  # Default value
     
-    @pytest.mark.unit
     def test_ai_converter_initialization_with_env_vars(self, reference_doc_path):
         """Test initialization with environment variable overrides."""
         # Arrange
@@ -55,11 +126,10 @@ class TestAIDocumentConverter:
         assert converter.timeout == 300
         assert converter.enable_haiku_fallback == False
     
-    @pytest.mark.unit
-    def test_create_analysis_prompt(self, reference_doc_path):
+    def test_create_analysis_prompt(self, ai_converter):
         """Test creation of analysis prompt for Claude."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
+        converter = ai_converter
         test_text = "This is a test document with some content."
         
         # Act
@@ -73,7 +143,6 @@ class TestAIDocumentConverter:
         assert test_text in prompt
         assert "Process the ENTIRE document in one response" in prompt
     
-    @pytest.mark.unit
     @pytest.mark.claude
     def test_call_claude_success(self, reference_doc_path, mock_claude_success):
         """Test successful Claude CLI call."""
@@ -89,13 +158,13 @@ class TestAIDocumentConverter:
         assert "# Test Document" in result
         assert "Chapter 1: Introduction" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
-    def test_call_claude_timeout(self, reference_doc_path, mock_claude_timeout):
+    def test_call_claude_timeout(self, reference_doc_path, mock_manager):
         """Test Claude CLI timeout handling."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         test_prompt = "Test prompt"
+        mock_manager.claude_mock.add_timeout_response()
         
         # Act
         success, result = converter._call_claude(test_prompt)
@@ -104,7 +173,6 @@ class TestAIDocumentConverter:
         assert success is False
         assert "timed out" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
     def test_call_claude_error(self, reference_doc_path, mock_claude_error):
         """Test Claude CLI error handling."""
@@ -119,7 +187,6 @@ class TestAIDocumentConverter:
         assert success is False
         assert "Claude API error" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
     def test_call_claude_incomplete_response(self, reference_doc_path, mock_claude_incomplete):
         """Test detection of incomplete Claude responses."""
@@ -134,7 +201,6 @@ class TestAIDocumentConverter:
         assert success is False
         assert "incomplete response" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
     def test_call_claude_file_not_found(self, reference_doc_path):
         """Test Claude CLI not found error handling."""
@@ -150,9 +216,8 @@ class TestAIDocumentConverter:
         assert success is False
         assert "Claude CLI not found" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
-    def test_call_claude_with_custom_model(self, reference_doc_path, mock_claude_success):
+    def test_call_claude_with_custom_model(self, reference_doc_path, mock_manager):
         """Test Claude CLI call with custom model."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
@@ -164,15 +229,10 @@ class TestAIDocumentConverter:
         # Assert
         assert success is True
         # Verify that the correct model was used in the subprocess call
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = "Test output"
-            converter._call_claude(test_prompt, model='haiku')
-            mock_run.assert_called_once()
-            args = mock_run.call_args[0][0]
-            assert 'haiku' in args
-    
-    @pytest.mark.unit 
+        args = mock_manager.claude_mock.get_last_claude_call()['cmd']
+        assert args[0] == 'claude'
+        assert 'haiku' in args
+    
     def test_detect_non_english_text_sanskrit(self, reference_doc_path):
         """Test detection of Sanskrit transliterated text."""
         # Arrange
@@ -194,7 +254,6 @@ class TestAIDocumentConverter:
         result = converter._detect_non_english_text(already_italic)
         assert result == "*Existing italic text*"
     
-    @pytest.mark.unit
     def test_detect_non_english_text_devanagari(self, reference_doc_path):
         """Test detection of Devanagari script."""
         # Arrange
@@ -211,7 +270,6 @@ class TestAIDocumentConverter:
         result = converter._detect_non_english_text(sanskrit_deva)
         assert result == "*सत्यमेव जयते*"
     
-    @pytest.mark.unit
     def test_detect_non_english_text_regular_english(self, reference_doc_path):
         """Test that regular English text is not italicized."""
         # Arrange
@@ -227,7 +285,6 @@ class TestAIDocumentConverter:
         result = converter._detect_non_english_text(mixed_text)
         assert result == "Test123!@# with symbols"
     
-    @pytest.mark.unit
     def test_simple_text_to_markdown_headings(self, reference_doc_path):
         """Test simple text to markdown conversion - heading detection."""
         # Arrange
@@ -252,7 +309,6 @@ More content."""
         assert "## Chapter One: Introduction" in result
         assert "## Section 1.1: Details" in result
     
-    @pytest.mark.unit
     def test_simple_text_to_markdown_lists(self, reference_doc_path):
         """Test simple text to markdown conversion - list detection."""
         # Arrange
@@ -278,7 +334,6 @@ Numbered list:
         assert "1. First numbered" in result
         assert "2. Second numbered" in result
     
-    @pytest.mark.unit
     def test_simple_text_to_markdown_non_english(self, reference_doc_path):
         """Test simple text to markdown with non-English text detection."""
         # Arrange
@@ -298,12 +353,11 @@ Devanagari: हिन्दी परीक्षण text."""
         assert "*हिन्दी परीक्षण*" in result or "हिन्दी परीक्षण" in result
         assert "Regular English paragraph." in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
-    def test_process_small_text_success(self, reference_doc_path, mock_claude_success):
+    def test_process_small_text_success(self, ai_converter, mock_claude_success):
         """Test processing small text that doesn't require chunking."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
+        converter = ai_converter
         small_text = "This is a small test document."
         
         # Act
@@ -313,50 +367,31 @@ Devanagari: हिन्दी परीक्षण text."""
         assert result is not None
         assert "# Test Document" in result
     
-    @pytest.mark.unit
     @pytest.mark.claude
-    def test_process_large_text_chunking(self, reference_doc_path, mock_claude_success):
+    def test_process_large_text_chunking(self, ai_converter, mock_claude_success):
         """Test processing large text that requires chunking."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
-        # Create text larger than chunk size
-        large_text = "Chapter 1\n\n" + ("Test paragraph. " * 100) + "\n\nChapter 2\n\n" + ("Another paragraph. " * 100)
-        
+        converter = ai_converter
         # Act
-        result = converter._process_in_chunks(large_text, chunk_size=500)
+        result = converter._process_in_chunks(_LARGE_CHUNKED, chunk_size=500)
         
         # Assert
         assert result is not None
         # Should contain content from both chunks
         assert "Test Document" in result  # From mock response
     
-    @pytest.mark.unit
     @pytest.mark.claude
-    def test_process_chunks_with_haiku_fallback(self, reference_doc_path):
+    def test_process_chunks_with_haiku_fallback(self, ai_converter):
         """Test chunking with Haiku fallback on timeout."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
+        converter = ai_converter
         converter.enable_haiku_fallback = True
         converter.model = 'sonnet'
         
         small_text = "Test document"
         
         # Mock initial timeout, then success with Haiku
-        def mock_run_with_fallback(cmd, **kwargs):
-            if '--model' in cmd and 'sonnet' in cmd:
-                raise subprocess.TimeoutExpired(cmd, 600)
-            elif '--model' in cmd and 'haiku' in cmd:
-                mock_result = MagicMock()
-                mock_result.returncode = 0
-                mock_result.stdout = "# Converted with Haiku\n\nTest content"
-                mock_result.stderr = ""
-                return mock_result
-            else:
-                mock_result = MagicMock()
-                mock_result.returncode = 1
-                return mock_result
-        
-        with patch('subprocess.run', side_effect=mock_run_with_fallback):
+        with patch('subprocess.run', side_effect=_HAIKU_FALLBACK_ROUTER):
             # Act
             result = converter._process_in_chunks(small_text)
         
@@ -365,11 +400,10 @@ Devanagari: हिन्दी परीक्षण text."""
         assert "Converted with Haiku" in result
         assert converter.model == 'haiku'  # Should switch to haiku
     
-    @pytest.mark.unit
-    def test_process_chunks_fallback_to_simple(self, reference_doc_path, mock_claude_error):
+    def test_process_chunks_fallback_to_simple(self, ai_converter, mock_claude_error):
         """Test fallback to simple conversion when Claude fails."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
+        converter = ai_converter
         test_text = "Simple test\n\nAnother paragraph"
         
         # Act
@@ -378,14 +412,14 @@ Devanagari: हिन्दी परीक्षण text."""
         # Assert
         assert result is None  # Claude failed, method returns None for single chunk failure
     
-    @pytest.mark.unit
+    @pytest.mark.slow
     @pytest.mark.claude
-    def test_convert_text_file_success(self, reference_doc_path, sample_text_file, temp_dir, mock_claude_success, mock_notifications):
+    def test_convert_text_file_success(self, reference_doc_path, sample_text_file, tmp_path, mock_claude_success, mock_notifications):
         """Test successful conversion of a text file."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False  # Disable progress for cleaner test
-        output_path = temp_dir / "output.docx"
+        output_path = tmp_path / "output.docx"
         
         # Act
         result = converter.convert_with_ai(str(sample_text_file), str(output_path))
@@ -398,13 +432,13 @@ Devanagari: हिन्दी परीक्षण text."""
         markdown_path = output_path.parent / f"{sample_text_file.stem}_markdown.md"
         assert markdown_path.exists()
     
-    @pytest.mark.unit
-    def test_convert_rtf_file(self, reference_doc_path, sample_rtf_file, temp_dir, mock_claude_success, mock_notifications):
+    @pytest.mark.slow
+    def test_convert_rtf_file(self, reference_doc_path, sample_rtf_file, tmp_path, mock_claude_success, mock_notifications):
         """Test conversion of RTF files."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False
-        output_path = temp_dir / "output.docx"
+        output_path = tmp_path / "output.docx"
         
         # Act
         result = converter.convert_with_ai(str(sample_rtf_file), str(output_path))
@@ -413,39 +447,33 @@ Devanagari: हिन्दी परीक्षण text."""
         assert result is True
         assert output_path.exists()
     
-    @pytest.mark.unit
-    def test_convert_empty_file(self, reference_doc_path, empty_text_file, temp_dir, mock_notifications):
+    def test_convert_empty_file(self, reference_doc_path, empty_text_file):
         """Test conversion of empty files."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False
-        output_path = temp_dir / "output.docx"
-        
-        # Act
-        result = converter.convert_with_ai(str(empty_text_file), str(output_path))
         
-        # Assert
-        assert result is False  # Should fail for empty files
+        # Act & Assert
+        assert converter._read_input(empty_text_file) == ""
+        assert converter.convert_with_ai(str(empty_text_file)) is False  # Empty-input guard
     
-    @pytest.mark.unit
-    def test_convert_nonexistent_file(self, reference_doc_path, temp_dir, mock_notifications):
-        """Test conversion of non-existent files."""
+    def test_convert_nonexistent_file(self, reference_doc_path, tmp_path):
+        """Test reading of non-existent files."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
-        nonexistent_file = temp_dir / "nonexistent.txt"
-        output_path = temp_dir / "output.docx"
+        nonexistent_file = tmp_path / "nonexistent.txt"
         
         # Act & Assert
         with pytest.raises(FileNotFoundError):
-            converter.convert_with_ai(str(nonexistent_file), str(output_path))
+            converter._read_input(nonexistent_file)
     
-    @pytest.mark.unit
-    def test_convert_with_claude_fallback(self, reference_doc_path, sample_text_file, temp_dir, mock_notifications):
+    @pytest.mark.slow
+    def test_convert_with_claude_fallback(self, reference_doc_path, sample_text_file, tmp_path, mock_notifications):
         """Test conversion with fallback to simple when Claude fails."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False
-        output_path = temp_dir / "output.docx"
+        output_path = tmp_path / "output.docx"
         
         # Mock Claude to always fail
         with patch.object(converter, '_process_in_chunks', return_value=None):
@@ -456,13 +484,13 @@ Devanagari: हिन्दी परीक्षण text."""
         assert result is True  # Should still succeed with simple fallback
         assert output_path.exists()
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'SAVE_MARKDOWN': '0'})
-    def test_convert_no_markdown_save(self, reference_doc_path, sample_text_file, temp_dir, mock_claude_success, mock_notifications):
+    @pytest.mark.slow
+    def test_convert_no_markdown_save(self, reference_doc_path, sample_text_file, tmp_path, monkeypatch, mock_claude_success, mock_notifications):
         """Test that markdown is not saved when disabled."""
         # Arrange
+        monkeypatch.setenv('SAVE_MARKDOWN', '0')
         converter = AIDocumentConverter(str(reference_doc_path))
-        output_path = temp_dir / "output.docx"
+        output_path = tmp_path / "output.docx"
         
         # Act
         result = converter.convert_with_ai(str(sample_text_file), str(output_path))
@@ -474,13 +502,13 @@ Devanagari: हिन्दी परीक्षण text."""
         markdown_path = output_path.parent / f"{sample_text_file.stem}_markdown.md"
         assert not markdown_path.exists()
     
-    @pytest.mark.unit
-    def test_convert_with_custom_output_path(self, reference_doc_path, sample_text_file, temp_dir, mock_claude_success, mock_notifications):
+    @pytest.mark.slow
+    def test_convert_with_custom_output_path(self, reference_doc_path, sample_text_file, tmp_path, mock_claude_success, mock_notifications):
         """Test conversion with custom output path."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False
-        custom_output = temp_dir / "custom_name.docx"
+        custom_output = tmp_path / "custom_name.docx"
         
         # Act
         result = converter.convert_with_ai(str(sample_text_file), str(custom_output))
@@ -489,13 +517,13 @@ Devanagari: हिन्दी परीक्षण text."""
         assert result is True
         assert custom_output.exists()
     
-    @pytest.mark.unit
-    def test_convert_markdown_file_direct(self, reference_doc_path, sample_markdown_file, temp_dir, mock_notifications):
+    @pytest.mark.slow
+    def test_convert_markdown_file_direct(self, reference_doc_path, sample_markdown_file, tmp_path, mock_notifications):
         """Test direct conversion of markdown files without AI processing."""
         # Arrange
         converter = AIDocumentConverter(str(reference_doc_path))
         converter.show_progress = False
-        output_path = temp_dir / "output.docx"
+        output_path = tmp_path / "output.docx"
         
         # Act
         result = converter.convert_with_ai(str(sample_markdown_file), str(output_path))
@@ -504,13 +532,14 @@ Devanagari: हिन्दी परीक्षण text."""
         assert result is True
         assert output_path.exists()
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'ERROR_LOG': '/tmp/test_error.log'})
-    def test_error_logging(self, reference_doc_path, temp_dir, mock_notifications):
+    @pytest.mark.slow
+    def test_error_logging(self, reference_doc_path, tmp_path, monkeypatch, mock_notifications):
         """Test error logging functionality."""
         # Arrange
+        error_log = tmp_path / "error.log"
+        monkeypatch.setenv('ERROR_LOG', str(error_log))
         converter = AIDocumentConverter(str(reference_doc_path))
-        invalid_file = temp_dir / "invalid.txt" 
+        invalid_file = tmp_path / "invalid.txt" 
         invalid_file.write_bytes(b'\xff\xfe\x00\x00')  # Invalid UTF-8
         
         # Act
@@ -518,37 +547,20 @@ Devanagari: हिन्दी परीक्षण text."""
         
         # Assert
         assert result is False
-        # Error should be logged (we can't easily test file writing in isolation)
+        assert error_log.exists()  # Error should be logged
     
-    @pytest.mark.unit
+    @pytest.mark.slow
     @pytest.mark.claude
-    def test_notification_progress_tracking(self, reference_doc_path, large_text_file, mock_claude_success):
+    def test_notification_progress_tracking(self, ai_converter, large_text_file, mock_claude_success):
         """Test progress notifications during chunked processing."""
         # Arrange
-        converter = AIDocumentConverter(str(reference_doc_path))
+        converter = ai_converter
         converter.show_progress = True
         
-        with patch('subprocess.run') as mock_run:
-            # Mock Claude CLI success
-            claude_mock = MagicMock()
-            claude_mock.returncode = 0 
-            claude_mock.stdout = "# Converted chunk\n\nContent here"
-            claude_mock.stderr = ""
-            
-            # Mock notification calls to return success
-            notification_mock = MagicMock()
-            notification_mock.returncode = 0
-            
-            def selective_mock(cmd, **kwargs):
-                if 'claude' in str(cmd):
-                    return claude_mock
-                else:
-                    return notification_mock
-            
-            mock_run.side_effect = selective_mock
-            
+        # Mock Claude CLI success and notification calls
+        with patch('subprocess.run', side_effect=_CHUNK_ROUTER) as mock_run:
             # Act
-            result = converter._process_in_chunks("x" * 50000, chunk_size=10000)  # Force chunking
+            result = converter._process_in_chunks(_LARGE_TEXT_50K, chunk_size=10000)  # Force chunking
         
         # Assert
         assert result is not None
@@ -561,27 +573,24 @@ Devanagari: हिन्दी परीक्षण text."""
 class TestAIDocumentConverterConfiguration:
     """Test configuration and environment variable handling."""
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'CHUNK_THRESHOLD': '5000'})
-    def test_custom_chunk_threshold(self, reference_doc_path, mock_claude_success):
+    def test_custom_chunk_threshold(self, reference_doc_path, monkeypatch, mock_claude_success):
         """Test custom chunk threshold from environment."""
         # Arrange
+        monkeypatch.setenv('CHUNK_THRESHOLD', '5000')
         converter = AIDocumentConverter(str(reference_doc_path))
-        test_text = "x" * 6000  # Larger than custom threshold
         
         # Act
         with patch.object(converter, '_call_claude') as mock_call:
             mock_call.return_value = (True, "# Result")
-            converter._process_in_chunks(test_text)
+            converter._process_in_chunks(_TEXT_6K)  # Larger than custom threshold
         
         # Should be called multiple times due to chunking
         assert mock_call.call_count >= 1
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'CLAUDE_CLI_PATH': '/custom/path/claude'})
-    def test_custom_claude_path(self, reference_doc_path):
+    def test_custom_claude_path(self, reference_doc_path, monkeypatch):
         """Test custom Claude CLI path."""
         # Arrange
+        monkeypatch.setenv('CLAUDE_CLI_PATH', '/custom/path/claude')
         converter = AIDocumentConverter(str(reference_doc_path))
         
         with patch('subprocess.run') as mock_run:
@@ -599,28 +608,31 @@ class TestAIDocumentConverterConfiguration:
         call_args = mock_run.call_args[0][0]
         assert call_args[0] == '/custom/path/claude'
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'CLAUDE_TIMEOUT': '120'})
-    def test_custom_timeout(self, reference_doc_path):
-        """Test custom timeout setting."""
+    @pytest.mark.parametrize("env, value, attr, expected", [
+        ('CLAUDE_TIMEOUT', '120', 'timeout', 120),
+        ('ENABLE_HAIKU_FALLBACK', '0', 'enable_haiku_fallback', False),
+    ])
+    def test_env_override(self, monkeypatch, reference_doc_path, env, value, attr, expected):
+        """Test that environment variables override converter settings."""
         # Arrange
+        monkeypatch.setenv(env, value)
+        
+        # Act
         converter = AIDocumentConverter(str(reference_doc_path))
         
         # Assert
-        assert converter.timeout == 120
+        assert getattr(converter, attr) == expected
     
-    @pytest.mark.unit
-    @patch.dict(os.environ, {'ENABLE_HAIKU_FALLBACK': '0'})
-    def test_disable_haiku_fallback(self, reference_doc_path):
-        """Test disabling Haiku fallback."""
+    def test_timeout_without_haiku_fallback(self, monkeypatch, reference_doc_path):
+        """Test that a timeout is reported when Haiku fallback is disabled."""
         # Arrange
+        monkeypatch.setenv('ENABLE_HAIKU_FALLBACK', '0')
         converter = AIDocumentConverter(str(reference_doc_path))
         
-        # Assert
-        assert converter.enable_haiku_fallback is False
-        
-        # Test that fallback doesn't happen
+        # Act
         with patch('subprocess.run', side_effect=subprocess.TimeoutExpired(['claude'], 600)):
             success, result = converter._call_claude("test")
-            assert success is False
-            assert "timed out" in result
\ No newline at end of file
+        
+        # Assert
+        assert success is False
+        assert "timed out" in result
@@ -6,128 +6,86 @@ Tests the simplified document converter functionality.
 import pytest
 import sys
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 # Import after path setup in conftest.py
+import document_converter_simple as dcs
 from document_converter_simple import main
 
 
+# Default reference locations probed by main(), in lookup order
+_DEFAULT_REFERENCE_CANDIDATES = (
+    Path(dcs.__file__).parent / "referenceformat.docx",
+    Path.home() / "Documents" / "referenceformat.docx",
+    Path.home() / "Desktop" / "referenceformat.docx",
+)
+
+
+@pytest.fixture(scope="module")
+def sample_text_file(tmp_path_factory, _sample_text_bytes):
+    """Sample text file shared by this module; main() only ever reads it."""
+    text_file = tmp_path_factory.mktemp("docs") / "sample.txt"
+    text_file.write_bytes(_sample_text_bytes)
+    return text_file
+
+
+def _run_main_expecting_exit(test_args, code, converter_mock=None):
+    """Run main() with the given argv and assert it exits with the given code."""
+    with patch.object(sys, 'argv', test_args):
+        if converter_mock is None:
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+        else:
+            with patch.object(dcs, 'DocumentConverter', return_value=converter_mock):
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+    
+    assert exc_info.value.code == code
+
+
 class TestDocumentConverterSimple:
     """Test cases for the simple document converter."""
     
     @pytest.mark.unit
-    def test_main_with_reference_argument(self, reference_doc_path, sample_text_file, temp_dir, capsys):
+    def test_main_with_reference_argument(self, reference_doc_path, sample_text_file, capsys, converter_mock):
         """Test main function with reference argument provided."""
         # Arrange
-        output_path = temp_dir / f"{sample_text_file.stem}_formatted.docx"
+        output_path = sample_text_file.parent / f"{sample_text_file.stem}_formatted.docx"
         test_args = ['script_name', str(sample_text_file), '--reference', str(reference_doc_path)]
         
         # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                mock_converter = MagicMock()
-                mock_converter_class.return_value = mock_converter
-                
-                try:
-                    main()
-                except SystemExit as e:
-                    assert e.code == 0  # Should exit successfully
+        with patch.object(sys, 'argv', test_args):
+            with patch.object(dcs, 'DocumentConverter', return_value=converter_mock) as mock_converter_class:
+                main()
                 
         # Assert
         mock_converter_class.assert_called_once_with(str(reference_doc_path))
-        mock_converter.convert.assert_called_once_with(str(sample_text_file), str(output_path))
+        converter_mock.convert.assert_called_once_with(str(sample_text_file), str(output_path))
         
         captured = capsys.readouterr()
         assert f"Converting: {sample_text_file.name}" in captured.out
         assert f"Using reference: {reference_doc_path}" in captured.out
     
     @pytest.mark.unit
-    def test_main_with_default_reference_in_script_dir(self, sample_text_file, temp_dir, capsys):
-        """Test main function finding reference in script directory."""
-        # Arrange - Create reference file in script directory
-        script_dir = Path(__file__).parent.parent.parent  # Go up to project root
-        ref_path = script_dir / "referenceformat.docx"
-        
-        test_args = ['script_name', str(sample_text_file)]
-        
-        # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.Path.exists') as mock_exists:
-                # Mock that reference exists in script directory
-                def mock_exists_func(self):
-                    return str(self).endswith('referenceformat.docx') and 'scripts/wordformatterbyclaude' in str(self)
-                mock_exists.side_effect = mock_exists_func
-                
-                with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                    mock_converter = MagicMock()
-                    mock_converter_class.return_value = mock_converter
-                    
-                    try:
-                        main()
-                    except SystemExit as e:
-                        assert e.code == 0
-                
-        # Assert
-        mock_converter_class.assert_called_once()
-        # The exact path will vary, but should end with referenceformat.docx
-        call_args = mock_converter_class.call_args[0][0]
-        assert call_args.endswith('referenceformat.docx')
-    
-    @pytest.mark.unit
-    def test_main_with_reference_in_documents(self, sample_text_file, temp_dir, capsys):
-        """Test main function finding reference in Documents folder."""
+    @pytest.mark.parametrize("reference", _DEFAULT_REFERENCE_CANDIDATES,
+                             ids=["script_dir", "documents", "desktop"])
+    def test_main_finds_reference(self, reference, sample_text_file, capsys, converter_mock):
+        """Test main function finding the default reference in each search location."""
         # Arrange
         test_args = ['script_name', str(sample_text_file)]
+        # The input exists and the reference exists only at this candidate
+        truthy = frozenset({sample_text_file, reference})
         
         # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.Path.exists') as mock_exists:
-                # Mock that reference exists in Documents folder but not script dir
-                def mock_exists_func(self):
-                    return 'Documents' in str(self) and str(self).endswith('referenceformat.docx')
-                mock_exists.side_effect = mock_exists_func
+        with patch.object(sys, 'argv', test_args):
+            with patch.object(dcs.Path, 'exists', autospec=True) as mock_exists:
+                mock_exists.side_effect = lambda self: self in truthy
                 
-                with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                    mock_converter = MagicMock()
-                    mock_converter_class.return_value = mock_converter
-                    
-                    try:
-                        main()
-                    except SystemExit as e:
-                        assert e.code == 0
-                
-        # Assert
-        mock_converter_class.assert_called_once()
-        call_args = mock_converter_class.call_args[0][0]
-        assert 'Documents' in call_args and call_args.endswith('referenceformat.docx')
-    
-    @pytest.mark.unit
-    def test_main_with_reference_on_desktop(self, sample_text_file, temp_dir, capsys):
-        """Test main function finding reference on Desktop."""
-        # Arrange
-        test_args = ['script_name', str(sample_text_file)]
-        
-        # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.Path.exists') as mock_exists:
-                # Mock that reference exists on Desktop but not in other locations
-                def mock_exists_func(self):
-                    return 'Desktop' in str(self) and str(self).endswith('referenceformat.docx')
-                mock_exists.side_effect = mock_exists_func
-                
-                with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                    mock_converter = MagicMock()
-                    mock_converter_class.return_value = mock_converter
-                    
-                    try:
-                        main()
-                    except SystemExit as e:
-                        assert e.code == 0
+                with patch.object(dcs, 'DocumentConverter', return_value=converter_mock) as mock_converter_class:
+                    main()
                 
         # Assert
-        mock_converter_class.assert_called_once()
-        call_args = mock_converter_class.call_args[0][0]
-        assert 'Desktop' in call_args and call_args.endswith('referenceformat.docx')
+        mock_converter_class.assert_called_once_with(str(reference))
     
     @pytest.mark.unit
     def test_main_reference_not_found(self, sample_text_file, capsys):
@@ -136,12 +94,8 @@ class TestDocumentConverterSimple:
         test_args = ['script_name', str(sample_text_file)]
         
         # Act & Assert
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.Path.exists', return_value=False):
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                
-                assert exc_info.value.code == 1  # Should exit with error code
+        with patch.object(dcs.Path, 'exists', return_value=False):
+            _run_main_expecting_exit(test_args, 1)  # Should exit with error code
         
         # Check error message
         captured = capsys.readouterr()
@@ -156,11 +110,7 @@ class TestDocumentConverterSimple:
         test_args = ['script_name', str(sample_text_file), '--reference', str(nonexistent_ref)]
         
         # Act & Assert
-        with patch('sys.argv', test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            
-            assert exc_info.value.code == 1
+        _run_main_expecting_exit(test_args, 1)
         
         # Check error message
         captured = capsys.readouterr()
@@ -174,32 +124,22 @@ class TestDocumentConverterSimple:
         test_args = ['script_name', str(nonexistent_input), '--reference', str(reference_doc_path)]
         
         # Act & Assert
-        with patch('sys.argv', test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            
-            assert exc_info.value.code == 1
+        _run_main_expecting_exit(test_args, 1)
         
         # Check error message
         captured = capsys.readouterr()
         assert f"Error: Input file does not exist: {nonexistent_input}" in captured.out
     
     @pytest.mark.unit
-    def test_main_conversion_success(self, reference_doc_path, sample_text_file, capsys):
+    def test_main_conversion_success(self, reference_doc_path, sample_text_file, capsys, converter_mock):
         """Test successful conversion flow."""
         # Arrange
         test_args = ['script_name', str(sample_text_file), '--reference', str(reference_doc_path)]
         
         # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                mock_converter = MagicMock()
-                mock_converter_class.return_value = mock_converter
-                
-                try:
-                    main()
-                except SystemExit as e:
-                    assert e.code == 0
+        with patch.object(sys, 'argv', test_args):
+            with patch.object(dcs, 'DocumentConverter', return_value=converter_mock) as mock_converter_class:
+                main()
                 
         # Assert
         captured = capsys.readouterr()
@@ -208,49 +148,36 @@ class TestDocumentConverterSimple:
         assert "Success! Output saved to:" in captured.out
     
     @pytest.mark.unit
-    def test_main_conversion_error(self, reference_doc_path, sample_text_file, capsys):
+    def test_main_conversion_error(self, reference_doc_path, sample_text_file, capsys, converter_mock):
         """Test conversion error handling."""
         # Arrange
         test_args = ['script_name', str(sample_text_file), '--reference', str(reference_doc_path)]
         
+        converter_mock.convert.side_effect = Exception("Conversion failed")
+        
         # Act & Assert
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                mock_converter = MagicMock()
-                mock_converter.convert.side_effect = Exception("Conversion failed")
-                mock_converter_class.return_value = mock_converter
-                
-                with pytest.raises(SystemExit) as exc_info:
-                    main()
-                
-                assert exc_info.value.code == 1
+        _run_main_expecting_exit(test_args, 1, converter_mock)
         
         # Check error message
         captured = capsys.readouterr()
         assert "Error during conversion: Conversion failed" in captured.out
     
     @pytest.mark.unit
-    def test_main_with_short_arguments(self, reference_doc_path, sample_text_file):
+    def test_main_with_short_arguments(self, reference_doc_path, sample_text_file, converter_mock):
         """Test main function with short argument forms."""
         # Arrange
         test_args = ['script_name', str(sample_text_file), '-r', str(reference_doc_path)]
         
         # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                mock_converter = MagicMock()
-                mock_converter_class.return_value = mock_converter
-                
-                try:
-                    main()
-                except SystemExit as e:
-                    assert e.code == 0
+        with patch.object(sys, 'argv', test_args):
+            with patch.object(dcs, 'DocumentConverter', return_value=converter_mock) as mock_converter_class:
+                main()
                 
         # Assert
         mock_converter_class.assert_called_once_with(str(reference_doc_path))
     
     @pytest.mark.unit
-    def test_output_path_generation(self, reference_doc_path, temp_dir):
+    def test_output_path_generation(self, reference_doc_path, temp_dir, converter_mock):
         """Test that output path is generated correctly."""
         # Arrange
         input_file = temp_dir / "test_document.txt"
@@ -260,18 +187,12 @@ class TestDocumentConverterSimple:
         test_args = ['script_name', str(input_file), '--reference', str(reference_doc_path)]
         
         # Act
-        with patch('sys.argv', test_args):
-            with patch('document_converter_simple.DocumentConverter') as mock_converter_class:
-                mock_converter = MagicMock()
-                mock_converter_class.return_value = mock_converter
-                
-                try:
-                    main()
-                except SystemExit as e:
-                    assert e.code == 0
+        with patch.object(sys, 'argv', test_args):
+            with patch.object(dcs, 'DocumentConverter', return_value=converter_mock) as mock_converter_class:
+                main()
                 
         # Assert
-        mock_converter.convert.assert_called_once_with(str(input_file), str(expected_output))
+        converter_mock.convert.assert_called_once_with(str(input_file), str(expected_output))
     
     @pytest.mark.unit
     def test_argument_parsing_help(self):
@@ -279,13 +200,8 @@ class TestDocumentConverterSimple:
         # Arrange
         test_args = ['script_name', '--help']
         
-        # Act & Assert
-        with patch('sys.argv', test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            
-            # Help should exit with code 0
-            assert exc_info.value.code == 0
+        # Act & Assert - help should exit with code 0
+        _run_main_expecting_exit(test_args, 0)
     
     @pytest.mark.unit
     def test_argument_parsing_missing_input(self):
@@ -293,10 +209,5 @@ class TestDocumentConverterSimple:
         # Arrange
         test_args = ['script_name']  # Missing input file
         
-        # Act & Assert  
-        with patch('sys.argv', test_args):
-            with pytest.raises(SystemExit) as exc_info:
-                main()
-            
-            # Should exit with error code for missing required argument
-            assert exc_info.value.code == 2
\ No newline at end of file
+        # Act & Assert - should exit with error code for missing required argument
+        _run_main_expecting_exit(test_args, 2)
\ No newline at end of file
@@ -0,0 +1,775 @@
+"""
+Unit tests for text_to_markdown.py module.
+Tests the plain text to markdown converter and its simple fallback.
+"""
+
+import asyncio
+import importlib.util
+import io
+import json
+import pytest
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import text_to_markdown
+from text_to_markdown import (
+    TextToMarkdownConverter, convert_batch, convert_many, convert_text_to_markdown,
+    convert_text_to_markdown_async,
+)
+
+
+pytestmark = pytest.mark.unit
+
+
+_CLAUDE_OK = SimpleNamespace(returncode=0, stdout="# Converted\n\nBody", stderr="")
+_CLAUDE_FAILED = SimpleNamespace(returncode=1, stdout="", stderr="boom")
+_CLAUDE_BATCH_OK = SimpleNamespace(returncode=0, stdout="===MD_1===\n# One\n===MD_2===\n# Two\n", stderr="")
+
+
+@pytest.fixture
+def converter():
+    """Create a TextToMarkdownConverter."""
+    return TextToMarkdownConverter()
+
+
+@pytest.fixture(scope="session")
+def fast_md(tmp_path_factory):
+    """Build fast_md from the current fast_md.pyx and import it.
+    
+    Building here, rather than importing whatever fast_md is on sys.path,
+    means the parity test always checks the source in the tree.
+    """
+    pytest.importorskip("Cython")
+    build_dir = tmp_path_factory.mktemp("fast_md")
+    shutil.copy(Path(text_to_markdown.__file__).with_name("fast_md.pyx"), build_dir)
+    result = subprocess.run(
+        [sys.executable, '-m', 'Cython.Build.Cythonize', '-i', '-q', 'fast_md.pyx'],
+        cwd=build_dir, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        pytest.fail(f"Building fast_md failed:\n{result.stderr}")
+    
+    [module_path] = [*build_dir.glob("fast_md.*.so"), *build_dir.glob("fast_md.*.pyd")]
+    spec = importlib.util.spec_from_file_location("fast_md", module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(autouse=True)
+def claude_cache(tmp_path, monkeypatch):
+    """Point the Claude result cache at a per-test directory and start it empty."""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(text_to_markdown, 'CACHE_DIR', cache_dir)
+    text_to_markdown._memory_cache.clear()
+    yield cache_dir
+    text_to_markdown._memory_cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def fresh_converter(monkeypatch):
+    """Give each test its own shared converter so settings and clients don't leak."""
+    monkeypatch.setattr(text_to_markdown, '_converter_singleton', None)
+
+
+@pytest.fixture(autouse=True)
+def one_shot_cli(monkeypatch):
+    """Keep tests on the one-shot CLI path unless they opt into the API or a persistent CLI."""
+    monkeypatch.delenv('ANTHROPIC_API_KEY', raising=False)
+    monkeypatch.delenv('CLAUDE_PERSISTENT', raising=False)
+
+
+class _FakeStdin(io.StringIO):
+    """StringIO that keeps its contents readable after the caller closes it."""
+    
+    def close(self):
+        self.closed_by_caller = True
+
+
+class _FakeClaudeProcess:
+    """Stand-in for a stream-json Claude CLI process that answers each prompt with one result event."""
+    
+    def __init__(self, results=()):
+        self.stdin = _FakeStdin()
+        self.stdout = iter(
+            line
+            for result in results
+            for line in ('{"type": "system"}\n', json.dumps(result) + "\n")
+        )
+    
+    def poll(self):
+        return None
+    
+    def wait(self, timeout=None):
+        return 0
+    
+    def kill(self):
+        pass
+
+
+@pytest.fixture
+def fake_anthropic(monkeypatch):
+    """Install a stand-in Anthropic SDK and return its client."""
+    client = MagicMock()
+    client.messages.create.return_value = SimpleNamespace(
+        content=[SimpleNamespace(type="text", text="# From API\n")],
+        stop_reason="end_turn",
+    )
+    client.messages.stream.return_value.__enter__.return_value = SimpleNamespace(
+        text_stream=iter(["\n# Streamed", "\n\n", "Body", "\n"]),
+        get_final_message=lambda: SimpleNamespace(stop_reason="end_turn"),
+    )
+    sdk = SimpleNamespace(
+        Anthropic=MagicMock(return_value=client),
+        APITimeoutError=type("APITimeoutError", (Exception,), {}),
+    )
+    monkeypatch.setattr(text_to_markdown, 'anthropic', sdk)
+    return client
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    """Plain text input for the conversion entry points."""
+    path = tmp_path / "notes.txt"
+    path.write_text("Some notes to convert.", encoding='utf-8')
+    return path
+
+
+@pytest.fixture
+def batch_files(tmp_path):
+    """Two small text inputs for batch conversion."""
+    paths = [tmp_path / "one.txt", tmp_path / "two.txt"]
+    for path in paths:
+        path.write_text(f"Contents of {path.stem}.", encoding='utf-8')
+    return paths
+
+
+class TestSimpleTextToMarkdown:
+    """Test cases for the heuristic (non-AI) conversion."""
+    
+    def test_headings(self, converter):
+        """Title-cased and all-caps lines become level 2 headings."""
+        # Arrange
+        text = "Introduction To Testing\n\nCHAPTER ONE\n\nthis is a plain paragraph."
+        
+        # Act
+        result = converter._simple_text_to_markdown(text)
+        
+        # Assert
+        assert "## Introduction To Testing" in result
+        assert "## CHAPTER ONE" in result
+        assert "## this is a plain paragraph." not in result
+    
+    @pytest.mark.parametrize("line, expected", [
+        ("- dash item", "- dash item"),
+        ("*  star item", "- star item"),
+        ("• bullet item", "- bullet item"),
+    ])
+    def test_bullet_items(self, converter, line, expected):
+        """Every bullet marker is normalised to a markdown dash."""
+        assert converter._simple_text_to_markdown(line) == expected
+    
+    @pytest.mark.parametrize("line", ["1. first item", "12. twelfth item", "3a. sub item"])
+    def test_numbered_items(self, converter, line):
+        """Numbered items are kept verbatim."""
+        assert converter._simple_text_to_markdown(line) == line
+    
+    def test_numbered_accepts_any_digit(self, converter):
+        """Any str.isdigit() character, such as a superscript, starts a numbered item."""
+        # Arrange
+        text = "- bullet\n\u00b2. superscript item\nbody"
+        
+        # Act
+        result = converter._simple_text_to_markdown(text)
+        
+        # Assert
+        assert result == "- bullet\n\u00b2. superscript item\n\nbody"
+    
+    def test_numbered_requires_short_prefix(self, converter):
+        """A period after three or more digits does not start a numbered item."""
+        # Arrange
+        text = "intro\n123. not a list item"
+        
+        # Act
+        result = converter._simple_text_to_markdown(text)
+        
+        # Assert
+        assert result == text
+    
+    def test_paragraph_after_list(self, converter):
+        """A blank line separates a list from the paragraph that follows it."""
+        # Arrange
+        text = "- item\nsome closing words."
+        
+        # Act
+        result = converter._simple_text_to_markdown(text)
+        
+        # Assert
+        assert result == "- item\n\nsome closing words."
+    
+    def test_compiled_version_matches(self, converter, fast_md, monkeypatch):
+        """The compiled fast_md conversion produces the same markdown as the pure-Python one."""
+        # Arrange
+        monkeypatch.setattr(text_to_markdown, '_compiled_simple_text_to_markdown', None)
+        text = ("Title Of Book\n\n\"Quoted Title\"\n- one\n•two\n1. three\n123. four\n"
+                "after list\nlower start Line\n\u0663. arabic\n\u00b2. superscript\n  indented text  ")
+        
+        # Act & Assert
+        assert fast_md.simple_text_to_markdown(text) == converter._simple_text_to_markdown(text)
+
+
+class TestCallClaude:
+    """Test cases for choosing between the Anthropic API and the CLI."""
+    
+    def test_api_used_with_key(self, converter, fake_anthropic, monkeypatch):
+        """With the SDK and an API key, Claude is called in-process."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        
+        # Act
+        with patch('subprocess.run') as mock_run:
+            success, output = converter._call_claude("prompt")
+        
+        # Assert
+        assert (success, output) == (True, "# From API")
+        mock_run.assert_not_called()
+        assert fake_anthropic.messages.create.call_args.kwargs['model'] == 'claude-sonnet-4-5'
+    
+    def test_api_timeout(self, converter, fake_anthropic, monkeypatch):
+        """API timeouts are reported like CLI timeouts."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        fake_anthropic.messages.create.side_effect = text_to_markdown.anthropic.APITimeoutError()
+        
+        # Act & Assert
+        assert converter._call_claude("prompt") == (False, "Claude analysis timed out")
+    
+    def test_api_truncated_reply_rejected(self, converter, fake_anthropic, monkeypatch):
+        """A reply that stopped at the token limit is a failure, not a result."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        fake_anthropic.messages.create.return_value.stop_reason = "max_tokens"
+        
+        # Act
+        success, output = converter._call_claude("prompt")
+        
+        # Assert
+        assert not success
+        assert "token limit" in output
+    
+    def test_cli_used_without_key(self, converter, fake_anthropic):
+        """Without an API key the CLI is used even if the SDK is installed."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            success, output = converter._call_claude("prompt")
+        
+        # Assert
+        assert success
+        assert mock_run.call_args[0][0][:3] == ['claude', '--model', 'sonnet']
+        fake_anthropic.messages.create.assert_not_called()
+    
+    def test_persistent_cli_fresh_session_per_prompt(self, monkeypatch):
+        """With CLAUDE_PERSISTENT=1 each prompt goes to its own CLI process."""
+        # Arrange
+        monkeypatch.setenv('CLAUDE_PERSISTENT', '1')
+        converter = TextToMarkdownConverter()
+        processes = [
+            _FakeClaudeProcess([{"type": "result", "is_error": False, "result": "# First\n"}]),
+            _FakeClaudeProcess([{"type": "result", "is_error": False, "result": "# Second"}]),
+        ]
+        
+        # Act
+        with patch('subprocess.Popen', side_effect=processes) as mock_popen:
+            first = converter._call_claude("prompt one")
+            second = converter._call_claude("prompt two")
+        
+        # Assert
+        assert (first, second) == ((True, "# First"), (True, "# Second"))
+        assert mock_popen.call_count == 2
+        assert '--input-format' in mock_popen.call_args[0][0]
+        for process, prompt in zip(processes, ["prompt one", "prompt two"]):
+            sent = [json.loads(line) for line in process.stdin.getvalue().splitlines()]
+            assert [m["message"]["content"] for m in sent] == [prompt]
+            assert process.stdin.closed_by_caller
+        assert converter._process is None
+    
+    def test_persistent_cli_prestarts_expected_calls(self, monkeypatch):
+        """The next process is started ahead of time only while more calls are expected."""
+        # Arrange
+        monkeypatch.setenv('CLAUDE_PERSISTENT', '1')
+        converter = TextToMarkdownConverter()
+        processes = [
+            _FakeClaudeProcess([{"type": "result", "is_error": False, "result": "# First"}]),
+            _FakeClaudeProcess([{"type": "result", "is_error": False, "result": "# Second"}]),
+        ]
+        converter.expect_calls(2)
+        
+        # Act & Assert
+        with patch('subprocess.Popen', side_effect=processes) as mock_popen:
+            assert converter._call_claude("prompt one") == (True, "# First")
+            assert converter._process is processes[1]
+            assert converter._call_claude("prompt two") == (True, "# Second")
+        assert mock_popen.call_count == 2
+        assert converter._process is None
+    
+    def test_persistent_cli_calls_run_concurrently(self, monkeypatch):
+        """Concurrent prompts are answered by separate processes at the same time."""
+        # Arrange
+        monkeypatch.setenv('CLAUDE_PERSISTENT', '1')
+        converter = TextToMarkdownConverter()
+        both_waiting = threading.Barrier(2, timeout=5)
+        
+        def start_process(*args, **kwargs):
+            process = _FakeClaudeProcess([{"type": "result", "is_error": False, "result": "# Done"}])
+            lines = process.stdout
+            process.stdout = (line for line in lines if both_waiting.wait() is not None)
+            return process
+        
+        # Act
+        with patch('subprocess.Popen', side_effect=start_process):
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(converter._call_claude, ["prompt one", "prompt two"]))
+        
+        # Assert
+        assert results == [(True, "# Done"), (True, "# Done")]
+    
+    def test_persistent_cli_error_result(self, monkeypatch):
+        """An error result from the persistent CLI is reported as a failure."""
+        # Arrange
+        monkeypatch.setenv('CLAUDE_PERSISTENT', '1')
+        process = _FakeClaudeProcess([{"type": "result", "is_error": True, "result": "rate limited"}])
+        
+        # Act
+        with patch('subprocess.Popen', return_value=process):
+            result = TextToMarkdownConverter()._call_claude("prompt")
+        
+        # Assert
+        assert result == (False, "rate limited")
+
+
+class TestReadText:
+    """Test cases for reading input files."""
+    
+    @pytest.mark.parametrize("threshold", [0, 1 << 20], ids=["mmap", "read_text"])
+    def test_matches_text_mode_read(self, tmp_path, monkeypatch, threshold):
+        """Both read paths decode UTF-8 and translate newlines like text mode."""
+        # Arrange
+        monkeypatch.setattr(text_to_markdown, 'MMAP_THRESHOLD', threshold)
+        path = tmp_path / "input.txt"
+        path.write_bytes("Caf\u00e9\r\nLine two\rLine three\n".encode('utf-8'))
+        
+        # Act
+        result = text_to_markdown._read_text(path)
+        
+        # Assert
+        assert result == "Caf\u00e9\nLine two\nLine three\n"
+
+
+class TestConvertTextToMarkdown:
+    """Test cases for convert_text_to_markdown and its Claude cache."""
+    
+    def test_ai_conversion_written(self, input_file):
+        """Claude's markdown is written next to the input."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            assert convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert input_file.with_suffix('.md').read_text(encoding='utf-8') == "# Converted\n\nBody"
+    
+    def test_repeat_conversion_uses_memory_cache(self, input_file):
+        """Converting the same text twice calls Claude once."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            convert_text_to_markdown(str(input_file))
+            convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert mock_run.call_count == 1
+    
+    def test_disk_cache_survives_memory_cache(self, input_file, claude_cache):
+        """A result on disk is reused after the in-memory cache is cleared."""
+        # Arrange
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            convert_text_to_markdown(str(input_file))
+        text_to_markdown._memory_cache.clear()
+        
+        # Act
+        with patch('subprocess.run') as mock_run:
+            assert convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        mock_run.assert_not_called()
+        assert len(list(claude_cache.glob("*-sonnet.md"))) == 1
+    
+    def test_failures_are_not_cached(self, input_file, claude_cache, capsys):
+        """A failed Claude call falls back to simple conversion and is retried next time."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_FAILED) as mock_run:
+            assert convert_text_to_markdown(str(input_file))
+            convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert mock_run.call_count == 2
+        assert not claude_cache.exists()
+        assert "Using simple text analysis" in capsys.readouterr().out
+    
+    def test_memory_cache_does_not_keep_prompts(self, input_file):
+        """The in-memory cache is keyed by prompt hash, not by the prompt text."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        [key] = text_to_markdown._memory_cache
+        assert not any("Some notes to convert." in str(part) for part in key)
+    
+    def test_disk_cache_disabled(self, input_file, claude_cache, monkeypatch):
+        """DOCFMT_CACHE=0 neither writes nor reads the disk cache."""
+        # Arrange
+        monkeypatch.setenv('DOCFMT_CACHE', '0')
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            convert_text_to_markdown(str(input_file))
+            text_to_markdown._memory_cache.clear()
+            convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert mock_run.call_count == 2
+        assert not claude_cache.exists()
+    
+    def test_claude_called_through_given_converter(self, converter):
+        """The cache calls Claude with the converter it was handed, not the shared one."""
+        # Arrange
+        converter.model = 'haiku'
+        
+        # Act
+        with patch.object(converter, '_call_claude', return_value=(True, "# Haiku")) as mock_call:
+            result = text_to_markdown._call_claude_cached(converter, "Some text")
+        
+        # Assert
+        assert result == (True, "# Haiku")
+        mock_call.assert_called_once()
+        assert text_to_markdown._converter_singleton is None
+    
+    def test_async_creates_output_directory(self, input_file, tmp_path):
+        """The async entry point writes into an output directory it creates."""
+        # Arrange
+        output_path = tmp_path / "out" / "nested" / "notes.md"
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            result = asyncio.run(convert_text_to_markdown_async(str(input_file), str(output_path)))
+        
+        # Assert
+        assert result
+        assert output_path.read_text(encoding='utf-8') == "# Converted\n\nBody"
+    
+    def test_async_streams_with_sdk(self, input_file, fake_anthropic, monkeypatch):
+        """The async entry point streams Claude's output to the file like the sync one."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        
+        # Act
+        result = asyncio.run(convert_text_to_markdown_async(str(input_file)))
+        
+        # Assert
+        assert result
+        assert input_file.with_suffix('.md').read_text(encoding='utf-8') == "# Streamed\n\nBody"
+        fake_anthropic.messages.create.assert_not_called()
+    
+    def test_output_overwritten(self, input_file):
+        """An existing, longer output file is truncated before writing."""
+        # Arrange
+        output_path = input_file.with_suffix('.md')
+        output_path.write_text("stale " * 100, encoding='utf-8')
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert output_path.read_text(encoding='utf-8') == "# Converted\n\nBody"
+    
+    def test_api_response_streamed_to_file(self, input_file, fake_anthropic, claude_cache, monkeypatch):
+        """With the SDK, Claude's output is streamed to the file and copied into the cache."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        
+        # Act
+        assert convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert input_file.with_suffix('.md').read_text(encoding='utf-8') == "# Streamed\n\nBody"
+        fake_anthropic.messages.create.assert_not_called()
+        cached = list(claude_cache.glob("*-sonnet.md"))
+        assert [path.read_text(encoding='utf-8') for path in cached] == ["# Streamed\n\nBody"]
+    
+    def test_truncated_stream_not_kept(self, input_file, fake_anthropic, claude_cache, monkeypatch):
+        """A stream cut off at the token limit is replaced by simple conversion and not cached."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        stream = fake_anthropic.messages.stream.return_value.__enter__.return_value
+        stream.get_final_message = lambda: SimpleNamespace(stop_reason="max_tokens")
+        
+        # Act
+        assert convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        assert input_file.with_suffix('.md').read_text(encoding='utf-8') == "Some notes to convert."
+        assert not claude_cache.exists()
+    
+    def test_stream_failure_falls_back_once(self, input_file, fake_anthropic, monkeypatch):
+        """A failed stream falls back to simple conversion without a second Claude call."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        fake_anthropic.messages.stream.side_effect = RuntimeError("connection reset")
+        
+        # Act
+        assert convert_text_to_markdown(str(input_file))
+        
+        # Assert
+        fake_anthropic.messages.create.assert_not_called()
+        assert input_file.with_suffix('.md').read_text(encoding='utf-8') == "Some notes to convert."
+    
+    def test_converter_shared_across_files(self, batch_files):
+        """Converting several files reuses one converter instance."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            with patch.object(text_to_markdown, 'TextToMarkdownConverter', wraps=TextToMarkdownConverter) as mock_class:
+                for path in batch_files:
+                    convert_text_to_markdown(str(path))
+        
+        # Assert
+        assert mock_class.call_count == 1
+
+
+class TestConvertBatch:
+    """Test cases for batching several files into one Claude prompt."""
+    
+    def test_split_batch_response(self):
+        """Sentinel-delimited replies split into per-document markdown."""
+        assert text_to_markdown._split_batch_response("===MD_1===\n# A\n===MD_2===\n# B", 2) == ["# A", "# B"]
+        assert text_to_markdown._split_batch_response("===MD_1===\n# A", 2) is None
+    
+    def test_batch_uses_one_claude_call(self, batch_files):
+        """Both files are converted from a single batched Claude call."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_BATCH_OK) as mock_run:
+            assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        assert mock_run.call_count == 1
+        prompt = mock_run.call_args[0][0][-1]
+        assert "Contents of one." in prompt and "Contents of two." in prompt
+        assert [p.with_suffix('.md').read_text(encoding='utf-8') for p in batch_files] == ["# One", "# Two"]
+    
+    def test_batch_results_cached(self, batch_files):
+        """A second run reuses the batched results without calling Claude."""
+        # Arrange
+        with patch('subprocess.run', return_value=_CLAUDE_BATCH_OK):
+            convert_batch([str(p) for p in batch_files])
+        text_to_markdown._memory_cache.clear()
+        
+        # Act
+        with patch('subprocess.run') as mock_run:
+            assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        mock_run.assert_not_called()
+        assert [p.with_suffix('.md').read_text(encoding='utf-8') for p in batch_files] == ["# One", "# Two"]
+    
+    def test_incomplete_batch_converts_individually(self, batch_files):
+        """A batched reply missing a document falls back to one call per file."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        assert mock_run.call_count == 3
+        assert all(p.with_suffix('.md').read_text(encoding='utf-8') == "# Converted\n\nBody" for p in batch_files)
+    
+    def test_failed_batch_converts_individually(self, batch_files):
+        """A failed batched call is retried one file at a time instead of going straight to simple conversion."""
+        # Act
+        with patch('subprocess.run', side_effect=[_CLAUDE_FAILED, _CLAUDE_OK, _CLAUDE_OK]) as mock_run:
+            assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        assert mock_run.call_count == 3
+        assert all(p.with_suffix('.md').read_text(encoding='utf-8') == "# Converted\n\nBody" for p in batch_files)
+    
+    def test_truncated_batch_reply_rejected(self, batch_files, fake_anthropic, monkeypatch):
+        """A batched API reply cut off at the token limit is not split, even with every sentinel present."""
+        # Arrange
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'test-key')
+        truncated = SimpleNamespace(
+            content=[SimpleNamespace(type="text", text="===MD_1===\n# One\n===MD_2===\n# Tw")],
+            stop_reason="max_tokens",
+        )
+        complete = fake_anthropic.messages.create.return_value
+        fake_anthropic.messages.create.side_effect = [truncated, complete, complete]
+        
+        # Act
+        assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        assert fake_anthropic.messages.create.call_count == 3
+        assert all(p.with_suffix('.md').read_text(encoding='utf-8') == "# From API" for p in batch_files)
+    
+    def test_batches_respect_size_cap(self, batch_files, monkeypatch):
+        """Files that would overflow MAX_BATCH_CHARS go in separate prompts."""
+        # Arrange
+        monkeypatch.setattr(text_to_markdown, 'MAX_BATCH_CHARS', 20)
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            assert convert_batch([str(p) for p in batch_files])
+        
+        # Assert
+        assert mock_run.call_count == 2
+    
+    def test_empty_file_fails_batch(self, batch_files, tmp_path):
+        """An empty input is reported while the other files are still converted."""
+        # Arrange
+        empty = tmp_path / "empty.txt"
+        empty.write_text("", encoding='utf-8')
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_BATCH_OK):
+            result = convert_batch([str(p) for p in batch_files] + [str(empty)])
+        
+        # Assert
+        assert result is False
+        assert all(p.with_suffix('.md').exists() for p in batch_files)
+
+
+class TestConvertMany:
+    """Test cases for concurrent per-file conversion."""
+    
+    def test_each_file_converted(self, batch_files, capsys):
+        """Every file gets its own Claude call and markdown output."""
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK) as mock_run:
+            assert convert_many([str(p) for p in batch_files], parallel=2)
+        
+        # Assert
+        assert mock_run.call_count == 2
+        assert all(p.with_suffix('.md').exists() for p in batch_files)
+        out = capsys.readouterr().out
+        assert "✓ one.txt" in out and "✓ two.txt" in out
+    
+    def test_failure_reported(self, batch_files, tmp_path):
+        """A file that cannot be converted makes the run fail."""
+        # Arrange
+        missing = tmp_path / "missing.txt"
+        
+        # Act
+        with patch('subprocess.run', return_value=_CLAUDE_OK):
+            result = convert_many([str(p) for p in batch_files] + [str(missing)])
+        
+        # Assert
+        assert result is False
+    
+    def test_shared_converter_created_once(self, monkeypatch):
+        """Threads asking for the shared converter at the same time get one instance."""
+        # Arrange
+        created = []
+        
+        def slow_converter():
+            time.sleep(0.01)
+            created.append(object())
+            return created[-1]
+        
+        monkeypatch.setattr(text_to_markdown, 'TextToMarkdownConverter', slow_converter)
+        
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: text_to_markdown._get_converter(), range(8)))
+        
+        # Assert
+        assert len(created) == 1
+        assert all(result is created[0] for result in results)
+
+
+class TestMain:
+    """Test cases for the command-line entry point."""
+    
+    @pytest.fixture(autouse=True)
+    def force_simple(self, monkeypatch):
+        """Keep command-line tests off Claude."""
+        monkeypatch.setenv('FORCE_SIMPLE', '1')
+    
+    def _run_main(self, *argv):
+        """Run main() with argv and return its exit code."""
+        with patch.object(sys, 'argv', ['text_to_markdown.py', *map(str, argv)]):
+            with pytest.raises(SystemExit) as exc_info:
+                text_to_markdown.main()
+        return exc_info.value.code
+    
+    @pytest.mark.parametrize("output_name", ["out.markdown", "out.md", "out.txt"])
+    def test_positional_output(self, input_file, tmp_path, output_name):
+        """A second path that is not another input file is the output, whatever its suffix."""
+        # Arrange
+        output_path = tmp_path / output_name
+        
+        # Act & Assert
+        assert self._run_main(input_file, output_path) == 0
+        assert output_path.read_text(encoding='utf-8') == "Some notes to convert."
+        assert not input_file.with_suffix(".md").exists()
+    
+    def test_existing_markdown_output_overwritten(self, input_file):
+        """An existing .md second argument is still treated as the output."""
+        # Arrange
+        output_path = input_file.with_name("previous.md")
+        output_path.write_text("stale", encoding='utf-8')
+        
+        # Act & Assert
+        assert self._run_main(input_file, output_path) == 0
+        assert output_path.read_text(encoding='utf-8') == "Some notes to convert."
+    
+    def test_output_option(self, input_file, tmp_path):
+        """-o names the output file explicitly."""
+        # Arrange
+        output_path = tmp_path / "explicit.txt"
+        
+        # Act & Assert
+        assert self._run_main(input_file, '-o', output_path) == 0
+        assert output_path.exists()
+    
+    def test_output_option_needs_single_input(self, batch_files, tmp_path):
+        """-o with several inputs is rejected."""
+        assert self._run_main(*batch_files, '-o', tmp_path / "out.md") == 1
+    
+    def test_two_existing_inputs_batched(self, batch_files):
+        """Two existing text files are converted side by side."""
+        # Act & Assert
+        assert self._run_main(*batch_files) == 0
+        assert all(p.with_suffix('.md').exists() for p in batch_files)
+    
+    def test_bracketed_filenames_used_literally(self, tmp_path):
+        """Existing files whose names contain glob characters are not expanded."""
+        # Arrange
+        input_path = tmp_path / "Notes [draft].txt"
+        input_path.write_text("Draft notes.", encoding='utf-8')
+        output_path = tmp_path / "Notes [final].md"
+        
+        # Act & Assert
+        assert self._run_main(input_path) == 0
+        assert (tmp_path / "Notes [draft].md").read_text(encoding='utf-8') == "Draft notes."
+        assert self._run_main(input_path, output_path) == 0
+        assert output_path.read_text(encoding='utf-8') == "Draft notes."
+    
+    def test_glob_pattern_expanded(self, batch_files, tmp_path):
+        """A pattern that is not an existing path is expanded."""
+        # Act & Assert
+        assert self._run_main(tmp_path / "*.txt") == 0
+        assert all(p.with_suffix('.md').exists() for p in batch_files)
@@ -0,0 +1,109 @@
+"""
+Unit tests for verify_fixes.py module.
+Tests the structural checks run against a formatted Word document.
+"""
+
+import pytest
+from docx import Document
+
+from verify_fixes import read_paragraphs, verify_document
+
+
+pytestmark = pytest.mark.unit
+
+
+def _build_document(path, heading_font="Times New Roman", page_breaks=True):
+    """Write a document containing every structure verify_document looks for."""
+    doc = Document()
+    gap = [""] if page_breaks else []
+    
+    for text in ["The Complete Guide to Spiritual Wisdom", *gap,
+                 "Dedicated to all seekers", *gap,
+                 "Contents", "Introduction", *gap]:
+        doc.add_paragraph(text)
+    
+    heading = doc.add_heading("Chapter 1: Beginnings", level=1)
+    heading.runs[0].font.name = heading_font
+    doc.add_paragraph("1. The Principle of Stillness")
+    doc.save(path)
+    return path
+
+
+class TestVerifyDocument:
+    """Test cases for verify_document."""
+    
+    def test_well_formed_document(self, tmp_path, capsys):
+        """A document with every fix applied passes all checks."""
+        # Arrange
+        doc_path = _build_document(tmp_path / "good.docx")
+        
+        # Act
+        result = verify_document(doc_path)
+        
+        # Assert
+        assert result == {'page_breaks_ok': True, 'fonts_ok': True, 'lists_ok': True}
+        assert "Heading 1: Times New Roman" in capsys.readouterr().out
+    
+    def test_missing_page_breaks(self, tmp_path):
+        """Sections without a following empty paragraph fail the page-break check."""
+        # Arrange
+        doc_path = _build_document(tmp_path / "no_breaks.docx", page_breaks=False)
+        
+        # Act
+        result = verify_document(doc_path)
+        
+        # Assert
+        assert result['page_breaks_ok'] is False
+        assert result['lists_ok'] is True
+    
+    def test_calibri_heading(self, tmp_path, capsys):
+        """A heading run set in Calibri fails the font check."""
+        # Arrange
+        doc_path = _build_document(tmp_path / "calibri.docx", heading_font="Calibri")
+        
+        # Act
+        result = verify_document(doc_path)
+        
+        # Assert
+        assert result['fonts_ok'] is False
+        assert "Found 1 headings using Calibri font" in capsys.readouterr().out
+    
+    @pytest.mark.parametrize("texts, expected", [
+        (["Contents", "", "The Complete Guide to Spiritual Wisdom", "", "Dedicated to all seekers", ""],
+         {"Title": True, "Dedication": True, "Contents": True}),
+        (["A Renamed Title", "", "Dedicated to all seekers", "", "Contents", ""],
+         {"Title": False, "Dedication": True, "Contents": True}),
+    ], ids=["out_of_order", "missing_title"])
+    def test_sections_found_independently(self, tmp_path, capsys, texts, expected):
+        """Each front-matter section is found regardless of order or of the others being missing."""
+        # Arrange
+        doc = Document()
+        for text in texts:
+            doc.add_paragraph(text)
+        doc_path = tmp_path / "front_matter.docx"
+        doc.save(doc_path)
+        
+        # Act
+        verify_document(doc_path)
+        
+        # Assert
+        out = capsys.readouterr().out
+        for section, found in expected.items():
+            assert f"{section} found: {found}" in out
+    
+    def test_font_taken_from_first_run_only(self, tmp_path):
+        """A font set on a later run does not count as the heading's font."""
+        # Arrange
+        doc = Document()
+        heading = doc.add_heading("", level=1)
+        heading.add_run("Chapter 1: ")
+        heading.add_run("Beginnings").font.name = "Calibri"
+        doc_path = tmp_path / "second_run_font.docx"
+        doc.save(doc_path)
+        
+        # Act
+        paragraphs = read_paragraphs(doc_path)
+        
+        # Assert
+        assert paragraphs == [("Chapter 1: Beginnings", "Heading 1", None)]
+        assert verify_document(doc_path)['fonts_ok'] is True
@@ -4,26 +4,55 @@ Provides reusable mocks for Claude CLI, notifications, and other external depend
 """
 
 import subprocess
-from typing import Dict, List, Optional, Callable, Any
-from unittest.mock import MagicMock, patch
+from collections import deque
+from types import MappingProxyType
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Callable, Any
+from unittest.mock import MagicMock, patch, mock_open as _mock_open
 
 
-class ClaudeMockManager:
-    """Manages Claude CLI mocking for various test scenarios."""
+_NOTIF_PREFIXES = ('terminal-notifier', 'osascript')
+_NOTIF_PHRASES = ('display notification', 'display alert')
+
+
+@lru_cache(maxsize=64)
+def _classify_executable(name: str) -> str:
+    """Classify a command's executable as 'claude', 'notify' or 'other'."""
+    name = name.lower()
+    if 'claude' in name:
+        return 'claude'
+    if any(prefix in name for prefix in _NOTIF_PREFIXES):
+        return 'notify'
+    return 'other'
+
+
+def _classify(cmd: list) -> str:
+    """Classify a subprocess command as 'claude', 'notify' or 'other'.
     
-    def __init__(self):
-        self.call_count = 0
-        self.call_history: List[Dict] = []
-        self.response_queue: List[Dict] = []
-        self.default_response = {
-            'returncode': 0,
-            'stdout': self._default_markdown_response(),
-            'stderr': ''
-        }
+    Only the executable name is cached; Claude commands carry the whole
+    prompt in their arguments, so caching on the full command would never
+    hit and would keep every prompt alive.
+    """
+    if not cmd:
+        return 'other'
     
-    def _default_markdown_response(self) -> str:
-        """Default Claude response for successful conversion."""
-        return """# Converted Document
+    kind = _classify_executable(cmd[0])
+    if kind != 'other':
+        return kind
+    
+    # Fall back to scanning the whole command line for AppleScript phrases
+    cmd_str = ' '.join(cmd).lower()
+    if any(phrase in cmd_str for phrase in _NOTIF_PHRASES):
+        return 'notify'
+    return 'other'
+
+
+def _is_claude(cmd) -> bool:
+    """Check if a subprocess command invokes the Claude CLI."""
+    return isinstance(cmd, list) and _classify(cmd) == 'claude'
+
+
+_DEFAULT_MARKDOWN = """# Converted Document
 
 ## Chapter 1: Introduction
 
@@ -46,12 +75,33 @@ Additional content showing the AI's text analysis capabilities.
 ## Conclusion
 
 The document has been successfully converted to markdown format."""
+
+# Default Claude response for successful conversion (read-only; assign a new dict to override)
+_DEFAULT_RESPONSE = MappingProxyType({
+    'returncode': 0,
+    'stdout': _DEFAULT_MARKDOWN,
+    'stderr': ''
+})
+
+
+class ClaudeMockManager:
+    """Manages Claude CLI mocking for various test scenarios."""
+    
+    default_response = _DEFAULT_RESPONSE
+    
+    def __init__(self, copy_on_record: bool = False):
+        # Recorded cmd/kwargs are stored by reference unless copy_on_record is set
+        self.copy_on_record = copy_on_record
+        self.call_count = 0
+        self.call_history: List[Dict] = []
+        self.response_queue: Deque = deque()
     
     def reset(self):
-        """Reset the mock state."""
+        """Reset the mock state, including any replaced default response."""
         self.call_count = 0
         self.call_history.clear()
         self.response_queue.clear()
+        self.default_response = _DEFAULT_RESPONSE
     
     def add_response(self, stdout: str, returncode: int = 0, stderr: str = ''):
         """Add a specific response to the queue."""
@@ -86,19 +136,23 @@ Would you like me to continue with the rest of the document?"""
     
     def mock_subprocess_run(self, cmd: List[str], **kwargs) -> MagicMock:
         """Mock subprocess.run for Claude CLI calls."""
+        return self._record_and_respond(cmd, kwargs, self._is_claude_call(cmd))
+    
+    def _record_and_respond(self, cmd: List[str], kwargs: Dict, is_claude: bool) -> MagicMock:
+        """Record a call already classified by the caller and return its mock result."""
         self.call_count += 1
         
         # Record the call
         call_record = {
             'call_number': self.call_count,
-            'cmd': cmd.copy() if isinstance(cmd, list) else cmd,
-            'kwargs': kwargs.copy(),
-            'is_claude_call': self._is_claude_call(cmd)
+            'cmd': cmd.copy() if self.copy_on_record and isinstance(cmd, list) else cmd,
+            'kwargs': kwargs.copy() if self.copy_on_record else kwargs,
+            'is_claude_call': is_claude
         }
         self.call_history.append(call_record)
         
         # Handle non-Claude calls (like notifications)
-        if not self._is_claude_call(cmd):
+        if not is_claude:
             mock_result = MagicMock()
             mock_result.returncode = 0
             mock_result.stdout = ''
@@ -107,13 +161,13 @@ Would you like me to continue with the rest of the document?"""
         
         # Handle timeout scenarios
         if self.response_queue and self.response_queue[0] == 'TIMEOUT':
-            self.response_queue.pop(0)
+            self.response_queue.popleft()
             timeout = kwargs.get('timeout', 600)
             raise subprocess.TimeoutExpired(cmd, timeout)
         
         # Get response (queue or default)
         if self.response_queue:
-            response = self.response_queue.pop(0)
+            response = self.response_queue.popleft()
         else:
             response = self.default_response
         
@@ -127,10 +181,7 @@ Would you like me to continue with the rest of the document?"""
     
     def _is_claude_call(self, cmd) -> bool:
         """Check if the command is a Claude CLI call."""
-        if isinstance(cmd, list) and len(cmd) > 0:
-            cmd_name = cmd[0].lower()
-            return 'claude' in cmd_name or cmd_name.endswith('claude')
-        return False
+        return _is_claude(cmd)
     
     def get_claude_calls(self) -> List[Dict]:
         """Get all Claude CLI calls made during testing."""
@@ -174,12 +225,7 @@ class NotificationMockManager:
     
     def _is_notification_call(self, cmd) -> bool:
         """Check if the command is a notification call."""
-        if isinstance(cmd, list) and len(cmd) > 0:
-            cmd_str = ' '.join(cmd).lower()
-            return any(keyword in cmd_str for keyword in [
-                'terminal-notifier', 'osascript', 'display notification', 'display alert'
-            ])
-        return False
+        return isinstance(cmd, list) and _classify(cmd) == 'notify'
     
     def _get_notification_type(self, cmd) -> str:
         """Determine the type of notification."""
@@ -215,7 +261,7 @@ class ComprehensiveMockManager:
         
         # Handle Claude CLI calls
         if self.claude_mock._is_claude_call(cmd):
-            return self.claude_mock.mock_subprocess_run(cmd, **kwargs)
+            return self.claude_mock._record_and_respond(cmd, kwargs, True)
         
         # Handle notification calls
         elif self.notification_mock._is_notification_call(cmd):
@@ -265,11 +311,15 @@ class FileSystemMockManager:
         self.file_contents: Dict[str, str] = {}
         self.file_permissions: Dict[str, int] = {}
         self.missing_files: List[str] = []
+        self._open_cache: Dict[tuple, MagicMock] = {}
     
     def add_file(self, path: str, content: str, permissions: int = 0o644):
         """Add a mock file with specified content and permissions."""
         self.file_contents[path] = content
         self.file_permissions[path] = permissions
+        # Drop cached handles built from any previous content
+        for key in [key for key in self._open_cache if key[0] == path]:
+            del self._open_cache[key]
     
     def add_missing_file(self, path: str):
         """Mark a file as missing (will raise FileNotFoundError)."""
@@ -281,8 +331,13 @@ class FileSystemMockManager:
             raise FileNotFoundError(f"No such file or directory: '{path}'")
         
         if path in self.file_contents:
-            from io import StringIO
-            return StringIO(self.file_contents[path])
+            key = (path, mode)
+            opener = self._open_cache.get(key)
+            if opener is None:
+                opener = _mock_open(read_data=self.file_contents[path])
+                self._open_cache[key] = opener
+            # Calling the opener rewinds its read data and returns the file handle
+            return opener()
         
         # Default behavior for unmocked files
         return open(path, mode, **kwargs)
@@ -304,7 +359,7 @@ The formatting has been applied correctly with proper structure.
 Document processing completed successfully."""
     
     def mock_run(cmd, **kwargs):
-        if isinstance(cmd, list) and any('claude' in str(arg).lower() for arg in cmd):
+        if _is_claude(cmd):
             mock_result = MagicMock()
             mock_result.returncode = 0
             mock_result.stdout = content
@@ -324,7 +379,7 @@ Document processing completed successfully."""
 def create_claude_error_mock(error_msg: str = "Claude API error") -> Callable:
     """Create a Claude error mock for testing error handling."""
     def mock_run(cmd, **kwargs):
-        if isinstance(cmd, list) and any('claude' in str(arg).lower() for arg in cmd):
+        if _is_claude(cmd):
             mock_result = MagicMock()
             mock_result.returncode = 1
             mock_result.stdout = ''
@@ -343,7 +398,7 @@ def create_claude_error_mock(error_msg: str = "Claude API error") -> Callable:
 def create_claude_timeout_mock(timeout_after: int = 600) -> Callable:
     """Create a Claude timeout mock for testing timeout scenarios."""
     def mock_run(cmd, timeout=None, **kwargs):
-        if isinstance(cmd, list) and any('claude' in str(arg).lower() for arg in cmd):
+        if _is_claude(cmd):
             raise subprocess.TimeoutExpired(cmd, timeout or timeout_after)
         else:
             mock_result = MagicMock()
@@ -4,24 +4,84 @@ Text to Markdown Converter
 Converts plain text to markdown using Claude AI or simple heuristics.
 """
 
+import argparse
+import asyncio
+import atexit
+import glob
+import hashlib
+import io
+import json
+import mmap
+import shutil
 import sys
 import os
+import re
 import subprocess
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Tuple
+from typing import List, Optional, TextIO, Tuple
 
+try:
+    import anthropic
+except ImportError:
+    # Without the SDK every call goes through the Claude CLI
+    anthropic = None
 
-class TextToMarkdownConverter:
-    """Convert plain text to markdown format."""
-    
-    def __init__(self):
-        self.debug = os.environ.get('WORD_FORMATTER_DEBUG', '0') == '1'
-    
-    def _create_analysis_prompt(self, text_content: str) -> str:
-        """Create the prompt for Claude to analyze and structure text."""
-        return f"""Convert the following plain text to well-structured markdown format.
+try:
+    # Compiled simple conversion, built from fast_md.pyx
+    import fast_md
+except ImportError:
+    fast_md = None
+
+# A build older than the fast_md.pyx next to this file may no longer match
+# the Python logic, so it is ignored until rebuilt
+_FAST_MD_SOURCE = Path(__file__).with_name('fast_md.pyx')
+if fast_md is not None and _FAST_MD_SOURCE.exists() and (
+        _FAST_MD_SOURCE.stat().st_mtime > Path(fast_md.__file__).stat().st_mtime):
+    fast_md = None
+_compiled_simple_text_to_markdown = fast_md.simple_text_to_markdown if fast_md is not None else None
+
+
+# Line classifiers for the simple (non-AI) conversion. A line's first
+# character decides whether it is a bullet and whether it may be a heading
+BULLET_STARTS = frozenset('-*•')
+NON_HEADING_STARTS = frozenset('-*•123')
+
+# Claude results persist here between runs, keyed by prompt hash and model;
+# DOCFMT_CACHE=0 turns the disk cache off
+CACHE_DIR = Path.home() / '.cache' / 'docfmt'
+
+# Recent Claude results are also kept in memory, keyed by (converter,
+# prompt hash, model); the prompts themselves are not retained
+MEMORY_CACHE_SIZE = 128
+_memory_cache: "OrderedDict[tuple, str]" = OrderedDict()
+_memory_cache_lock = threading.Lock()
+
+# The CLI takes short model aliases; the API needs model IDs
+API_MODEL_IDS = {
+    'sonnet': 'claude-sonnet-4-5',
+    'opus': 'claude-opus-4-1',
+    'haiku': 'claude-haiku-4-5',
+}
+# Output ceiling for API calls; a reply that reaches it is cut off, not finished
+API_MAX_TOKENS = 32_000
+CLAUDE_TIMEOUT = 120
 
-Instructions:
+# Several small files are sent to Claude in one prompt, each answer
+# introduced by a ===MD_<n>=== line. The markdown reply is about as long as
+# its input and has to arrive in one call, so a batch's input is capped by
+# what Claude writes within CLAUDE_TIMEOUT (and API_MAX_TOKENS)
+BATCH_SENTINEL_RE = re.compile(r'^===MD_(\d+)===[ \t]*$', re.MULTILINE)
+OUTPUT_TOKENS_PER_SECOND = 50
+CHARS_PER_TOKEN = 3
+MAX_BATCH_CHARS = min(API_MAX_TOKENS, CLAUDE_TIMEOUT * OUTPUT_TOKENS_PER_SECOND) * CHARS_PER_TOKEN
+
+# Inputs larger than this are read through mmap
+MMAP_THRESHOLD = 1 << 20
+
+ANALYSIS_RULES = """Instructions:
 1. Identify and mark headings based on context and formatting cues
 2. Detect lists (both bulleted and numbered) and format appropriately  
 3. Recognize quotes, citations, and special blocks
@@ -35,29 +95,157 @@ Important:
 - Do not add any content that wasn't in the original
 - Maintain the original tone and style
 - Focus on structure, not rewriting
-- If the text already has clear structure, preserve it
+- If the text already has clear structure, preserve it"""
+
+
+# Static parts of the single-document prompt, built once at import
+ANALYSIS_PROMPT_PREFIX = f"""Convert the following plain text to well-structured markdown format.
+
+{ANALYSIS_RULES}
 
 Return ONLY the markdown formatted text. Do not include any explanations, apologies, or commentary. Start directly with the converted markdown.
 
 Text to convert:
 ---
-{text_content}
----"""
+"""
+ANALYSIS_PROMPT_SUFFIX = "\n---"
+
+
+class TextToMarkdownConverter:
+    """Convert plain text to markdown format."""
+    
+    def __init__(self):
+        self.debug = os.environ.get('WORD_FORMATTER_DEBUG', '0') == '1'
+        self.model = os.environ.get('CLAUDE_MODEL', 'sonnet')
+        self.persistent = os.environ.get('CLAUDE_PERSISTENT', '0') == '1'
+        self._client = None
+        self._process = None
+        self._process_lock = threading.Lock()
+        self._expected_calls = 0
+        if self.persistent:
+            atexit.register(self._close_process)
+    
+    def _get_client(self):
+        """Return an Anthropic API client, or None when the SDK or an API key is missing."""
+        if self._client is None and anthropic is not None and os.environ.get('ANTHROPIC_API_KEY'):
+            self._client = anthropic.Anthropic()
+        return self._client
+    
+    def _create_analysis_prompt(self, text_content: str) -> str:
+        """Create the prompt for Claude to analyze and structure text."""
+        return ANALYSIS_PROMPT_PREFIX + text_content + ANALYSIS_PROMPT_SUFFIX
+    
+    def _create_batch_prompt(self, texts: List[str]) -> str:
+        """Create one prompt asking Claude to convert several texts at once."""
+        documents = "\n\n".join(
+            f"Document {i}:\n---\n{text}\n---" for i, text in enumerate(texts, 1)
+        )
+        return f"""Convert each of the following {len(texts)} plain text documents to well-structured markdown format.
+
+{ANALYSIS_RULES}
+
+Return ONLY the markdown formatted text of each document, in order. Begin each document's markdown with a line containing exactly ===MD_<number>=== (===MD_1===, ===MD_2===, ...). Do not include any explanations, apologies, or commentary.
+
+{documents}"""
     
     def _call_claude(self, prompt: str) -> Tuple[bool, str]:
-        """Call Claude CLI and return success status and output."""
+        """Call Claude and return success status and output.
+        
+        Uses the Anthropic API in-process when the SDK and an API key are
+        available, otherwise the Claude CLI (started ahead of each call when
+        CLAUDE_PERSISTENT=1).
+        """
+        model = self.model
+        
+        if self.debug:
+            print(f"Calling Claude ({model}) for text analysis...")
+        
+        client = self._get_client()
+        if client is not None:
+            return self._call_claude_api(client, model, prompt)
+        if self.persistent:
+            return self._call_claude_persistent(prompt)
+        return self._call_claude_cli(model, prompt)
+    
+    def _call_claude_api(self, client, model: str, prompt: str) -> Tuple[bool, str]:
+        """Call Claude through the Anthropic SDK."""
         try:
-            # Get model from environment or use default
-            model = os.environ.get('CLAUDE_MODEL', 'sonnet')
-            
+            response = client.messages.create(
+                model=API_MODEL_IDS.get(model, model),
+                max_tokens=API_MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=CLAUDE_TIMEOUT
+            )
+        except anthropic.APITimeoutError:
+            return False, "Claude analysis timed out"
+        except Exception as e:
+            return False, str(e)
+        
+        if response.stop_reason == "max_tokens":
+            return False, "Claude's reply was cut off at the output token limit"
+        
+        output = "".join(block.text for block in response.content if block.type == "text").strip()
+        if output:
             if self.debug:
-                print(f"Calling Claude ({model}) for text analysis...")
-            
+                print("Claude analysis successful")
+            return True, output
+        return False, "Claude returned an empty response"
+    
+    def _call_claude_streaming(self, prompt: str, out: TextIO) -> Tuple[bool, str]:
+        """Stream Claude's output into out as it arrives; requires the Anthropic SDK.
+        
+        Returns success status and an error message (empty on success).
+        """
+        client = self._get_client()
+        if client is None:
+            return False, "Anthropic SDK or API key not available"
+        
+        if self.debug:
+            print(f"Streaming Claude ({self.model}) text analysis...")
+        
+        # Strip the reply like the buffered path: drop leading whitespace and
+        # hold back trailing whitespace until more text follows it
+        has_text = False
+        pending = ""
+        try:
+            with client.messages.stream(
+                model=API_MODEL_IDS.get(self.model, self.model),
+                max_tokens=API_MAX_TOKENS,
+                messages=[{"role": "user", "content": prompt}],
+                timeout=CLAUDE_TIMEOUT
+            ) as stream:
+                for text in stream.text_stream:
+                    if not has_text:
+                        text = text.lstrip()
+                    body = text.rstrip()
+                    if body:
+                        out.write(pending + body)
+                        pending = text[len(body):]
+                        has_text = True
+                    elif has_text:
+                        pending += text
+                stop_reason = stream.get_final_message().stop_reason
+        except anthropic.APITimeoutError:
+            return False, "Claude analysis timed out"
+        except Exception as e:
+            return False, str(e)
+        
+        if stop_reason == "max_tokens":
+            return False, "Claude's reply was cut off at the output token limit"
+        if not has_text:
+            return False, "Claude returned an empty response"
+        if self.debug:
+            print("Claude analysis successful")
+        return True, ""
+    
+    def _call_claude_cli(self, model: str, prompt: str) -> Tuple[bool, str]:
+        """Call the Claude CLI in a subprocess."""
+        try:
             result = subprocess.run(
                 ['claude', '--model', model, '--print', prompt],
                 capture_output=True,
                 text=True,
-                timeout=120
+                timeout=CLAUDE_TIMEOUT
             )
             
             if result.returncode == 0 and result.stdout.strip():
@@ -76,94 +264,484 @@ Text to convert:
         except Exception as e:
             return False, str(e)
     
+    def _start_process(self) -> subprocess.Popen:
+        """Start a Claude CLI process that reads prompts as stream-json."""
+        return subprocess.Popen(
+            ['claude', '--print', '--model', self.model,
+             '--input-format', 'stream-json', '--output-format', 'stream-json', '--verbose'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            bufsize=1
+        )
+    
+    def expect_calls(self, count: int):
+        """Note that count more Claude calls are coming.
+        
+        With CLAUDE_PERSISTENT=1 a CLI process is started ahead of the next
+        call only while calls are expected, so a single conversion starts
+        just one process.
+        """
+        with self._process_lock:
+            self._expected_calls += count
+    
+    def _take_process(self) -> subprocess.Popen:
+        """Hand out the pre-started Claude CLI process, starting one if none is running."""
+        with self._process_lock:
+            process, self._process = self._process, None
+            self._expected_calls = max(0, self._expected_calls - 1)
+        if process is None or process.poll() is not None:
+            process = self._start_process()
+        return process
+    
+    def _prestart_process(self):
+        """Start the process for the next expected call, if there is one and none is waiting."""
+        with self._process_lock:
+            if self._expected_calls and self._process is None:
+                try:
+                    self._process = self._start_process()
+                except OSError:
+                    # The next call starts its own process and reports the error
+                    pass
+    
+    @staticmethod
+    def _retire_process(process: subprocess.Popen):
+        """Let a Claude CLI process that has answered its prompt exit in the background."""
+        def reap():
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        
+        if process.poll() is None:
+            process.stdin.close()
+            threading.Thread(target=reap, daemon=True).start()
+    
+    def _close_process(self):
+        """Stop the pre-started Claude CLI process, if any, and forget expected calls."""
+        with self._process_lock:
+            process, self._process = self._process, None
+            self._expected_calls = 0
+        if process is not None and process.poll() is None:
+            process.stdin.close()
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+    
+    def _call_claude_persistent(self, prompt: str) -> Tuple[bool, str]:
+        """Send a prompt to a pre-started Claude CLI process over stream-json.
+        
+        Each process answers a single prompt, so documents never share a
+        conversation. While more calls are expected (see expect_calls), the
+        next process is started as soon as a result arrives, so its CLI
+        start-up overlaps with the caller's work. Concurrent calls each get
+        their own process.
+        """
+        timed_out = threading.Event()
+        try:
+            process = self._take_process()
+            
+            def kill():
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(CLAUDE_TIMEOUT, kill)
+            timer.start()
+            try:
+                result = self._exchange(process, prompt)
+            finally:
+                timer.cancel()
+                self._retire_process(process)
+            
+            if result is None:
+                if timed_out.is_set():
+                    return False, "Claude analysis timed out"
+                return False, "Claude CLI exited unexpectedly"
+            
+            self._prestart_process()
+            return result
+            
+        except FileNotFoundError:
+            return False, "Claude CLI not found"
+        except Exception as e:
+            return False, str(e)
+    
+    def _exchange(self, process: subprocess.Popen, prompt: str) -> Optional[Tuple[bool, str]]:
+        """Write one prompt to a stream-json CLI process and read its result event.
+        
+        Returns None if the process exits before producing a result.
+        """
+        message = {"type": "user", "message": {"role": "user", "content": prompt}}
+        process.stdin.write(json.dumps(message) + "\n")
+        process.stdin.flush()
+        
+        for line in process.stdout:
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("type") != "result":
+                continue
+            
+            output = (event.get("result") or "").strip()
+            if event.get("is_error") or not output:
+                if self.debug:
+                    print(f"Claude returned error: {output}")
+                return False, output or "Claude returned an empty response"
+            if self.debug:
+                print("Claude analysis successful")
+            return True, output
+        return None
+    
     def _simple_text_to_markdown(self, text_content: str) -> str:
-        """Simple fallback conversion from text to markdown."""
+        """Simple fallback conversion from text to markdown.
+        
+        Uses the compiled fast_md version when it has been built.
+        """
+        if _compiled_simple_text_to_markdown is not None:
+            return _compiled_simple_text_to_markdown(text_content)
+        
         lines = text_content.split('\n')
-        markdown_lines = []
+        buf = io.StringIO()
+        write = buf.write
         in_list = False
         
+        # Every output line is written with a trailing newline; the final
+        # one is dropped on return
         for line in lines:
             stripped = line.strip()
             
             # Skip empty lines
             if not stripped:
-                markdown_lines.append('')
+                write('\n')
                 in_list = False
                 continue
             
+            first = stripped[0]
+            
             # Detect potential headings (lines that are title-cased or all caps)
-            if (len(stripped) < 100 and 
-                (stripped.istitle() or stripped.isupper()) and 
-                not any(stripped.startswith(c) for c in ['-', '*', '•', '1', '2', '3'])):
+            # A line starting with a lowercase letter can be neither, so
+            # skip the full-string istitle()/isupper() scans for it
+            if (first not in NON_HEADING_STARTS and 
+                not first.islower() and 
+                len(stripped) < 100 and 
+                (stripped.istitle() or stripped.isupper())):
                 # Add heading
-                markdown_lines.append(f"\n## {stripped}\n")
+                write('\n## ')
+                write(stripped)
+                write('\n\n')
                 in_list = False
+                continue
+            
             # Detect list items
-            elif any(stripped.startswith(c) for c in ['-', '*', '•']):
+            if first in BULLET_STARTS:
                 # Bullet list
-                markdown_lines.append(f"- {stripped[1:].strip()}")
+                write('- ')
+                write(stripped[1:].lstrip())
+                write('\n')
                 in_list = True
-            elif len(stripped) > 0 and stripped[0].isdigit() and '. ' in stripped[:4]:
+            elif stripped[0].isdigit() and '. ' in stripped[:4]:
                 # Numbered list
-                markdown_lines.append(stripped)
+                write(stripped)
+                write('\n')
                 in_list = True
             else:
                 # Regular paragraph
-                if in_list and stripped:
-                    markdown_lines.append('')
-                markdown_lines.append(line)
+                if in_list:
+                    write('\n')
+                write(line)
+                write('\n')
                 in_list = False
         
-        return '\n'.join(markdown_lines)
+        return buf.getvalue()[:-1]
 
 
-def convert_text_to_markdown(input_path: str, output_path: str = None) -> bool:
-    """Convert text file to markdown format."""
-    input_path = Path(input_path)
+_converter_singleton: Optional[TextToMarkdownConverter] = None
+_converter_lock = threading.Lock()
+
+
+def _get_converter() -> TextToMarkdownConverter:
+    """Return the shared converter, creating it on first use.
     
+    Sharing it means environment settings are read once per process and
+    the Anthropic client (with its connection pool) is reused across files.
+    """
+    global _converter_singleton
+    if _converter_singleton is None:
+        # convert_many calls this from worker threads; build the converter once
+        with _converter_lock:
+            if _converter_singleton is None:
+                _converter_singleton = TextToMarkdownConverter()
+    return _converter_singleton
+
+
+def _read_text(path: Path) -> str:
+    """Read a UTF-8 text file, mapping large files instead of streaming them through TextIOWrapper."""
+    if path.stat().st_size <= MMAP_THRESHOLD:
+        return path.read_text(encoding='utf-8')
+    
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text_content = str(mm, 'utf-8')
+    
+    # Match the universal-newline translation of text-mode reads
+    if '\r' in text_content:
+        text_content = text_content.replace('\r\n', '\n').replace('\r', '\n')
+    return text_content
+
+
+def _write_text(path: Path, content: str) -> None:
+    """Write content as UTF-8 straight to a file descriptor, skipping the TextIOWrapper layer."""
+    data = memoryview(content.encode('utf-8'))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+
+def _prompt_hash(prompt: str) -> str:
+    """Hash a prompt for use in Claude cache keys."""
+    return hashlib.blake2b(prompt.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def _cache_file(prompt_hash: str, model: str) -> Optional[Path]:
+    """Return the on-disk cache location for a prompt and model, or None if the disk cache is off."""
+    if os.environ.get('DOCFMT_CACHE', '1') == '0':
+        return None
+    return CACHE_DIR / f"{prompt_hash}-{model}.md"
+
+
+def _remember(key: tuple, markdown: str):
+    """Add a result to the in-memory cache, evicting the least recently used one when full."""
+    with _memory_cache_lock:
+        _memory_cache[key] = markdown
+        _memory_cache.move_to_end(key)
+        if len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+
+def _cache_lookup(converter: TextToMarkdownConverter, prompt_hash: str) -> Optional[str]:
+    """Return the cached markdown for a prompt hash from memory or disk, or None."""
+    key = (converter, prompt_hash, converter.model)
+    with _memory_cache_lock:
+        markdown = _memory_cache.get(key)
+        if markdown is not None:
+            _memory_cache.move_to_end(key)
+            return markdown
+    
+    cache_file = _cache_file(prompt_hash, converter.model)
+    if cache_file is None or not cache_file.exists():
+        return None
+    markdown = cache_file.read_text(encoding='utf-8')
+    _remember(key, markdown)
+    return markdown
+
+
+def _cache_store(converter: TextToMarkdownConverter, prompt_hash: str, markdown: str):
+    """Cache Claude's markdown for a prompt hash in memory and, unless disabled, on disk."""
+    _remember((converter, prompt_hash, converter.model), markdown)
+    
+    cache_file = _cache_file(prompt_hash, converter.model)
+    if cache_file is None:
+        return
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_file.write_text(markdown, encoding='utf-8')
+    except OSError:
+        # The disk cache is best-effort
+        pass
+
+
+def _analysis_hash(converter: TextToMarkdownConverter, text_content: str) -> str:
+    """Return the cache hash of the single-document prompt for text_content."""
+    return _prompt_hash(converter._create_analysis_prompt(text_content))
+
+
+def _call_claude_cached(converter: TextToMarkdownConverter, text_content: str) -> Tuple[bool, str]:
+    """Call Claude for text_content, answering repeats from the memory or disk cache."""
+    prompt = converter._create_analysis_prompt(text_content)
+    prompt_hash = _prompt_hash(prompt)
+    
+    markdown = _cache_lookup(converter, prompt_hash)
+    if markdown is not None:
+        return True, markdown
+    
+    success, result = converter._call_claude(prompt)
+    if success:
+        # Failed calls are never cached
+        _cache_store(converter, prompt_hash, result)
+    return success, result
+
+
+def _stream_claude_to_file(converter: TextToMarkdownConverter, text_content: str,
+                           output_path: Path) -> Optional[bool]:
+    """Stream Claude's markdown for text_content straight into output_path.
+    
+    Returns None when streaming does not apply (no SDK client, or the
+    result is already cached), otherwise whether streaming succeeded. A
+    successful result is copied from the written file into the disk cache,
+    so the response is never held in memory as a whole.
+    """
+    if converter._get_client() is None:
+        return None
+    
+    prompt = converter._create_analysis_prompt(text_content)
+    prompt_hash = _prompt_hash(prompt)
+    if _cache_lookup(converter, prompt_hash) is not None:
+        return None
+    cache_file = _cache_file(prompt_hash, converter.model)
+    
+    with open(output_path, 'w', encoding='utf-8') as out:
+        success, error = converter._call_claude_streaming(prompt, out)
+    
+    if not success:
+        print(f"AI unavailable: {error}")
+        return False
+    if cache_file is None:
+        return True
+    
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(output_path, cache_file)
+    except OSError:
+        # The disk cache is best-effort
+        pass
+    return True
+
+
+def _split_batch_response(response: str, count: int) -> Optional[List[str]]:
+    """Split a batched Claude reply into per-document markdown, or None if any is missing."""
+    parts = BATCH_SENTINEL_RE.split(response)
+    markdown = {int(number): body.strip() for number, body in zip(parts[1::2], parts[2::2])}
+    if sorted(markdown) != list(range(1, count + 1)) or not all(markdown.values()):
+        return None
+    return [markdown[i] for i in range(1, count + 1)]
+
+
+def _batch_by_size(jobs: list) -> List[list]:
+    """Group (input, output, text) jobs so each batch's text fits in MAX_BATCH_CHARS."""
+    batches = []
+    current = []
+    current_size = 0
+    
+    for job in jobs:
+        size = len(job[2])
+        if current and current_size + size > MAX_BATCH_CHARS:
+            batches.append(current)
+            current = []
+            current_size = 0
+        current.append(job)
+        current_size += size
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _convert_text(converter: TextToMarkdownConverter, text_content: str) -> str:
+    """Convert text with Claude, falling back to the simple heuristics."""
+    # Check if we should force simple conversion
+    if os.environ.get('FORCE_SIMPLE', '0') == '1':
+        print("Using simple text analysis (forced)...")
+        return converter._simple_text_to_markdown(text_content)
+    
+    # Try AI analysis first
+    success, result = _call_claude_cached(converter, text_content)
+    
+    if success:
+        print("✓ AI analysis successful")
+        return result
+    
+    # Fallback to simple conversion
+    print(f"AI unavailable: {result}")
+    print("Using simple text analysis...")
+    return converter._simple_text_to_markdown(text_content)
+
+
+def _output_path(input_path: Path, output_path: Optional[str]) -> Path:
+    """Return the markdown path for input_path, defaulting to <input>.md beside it."""
     if not output_path:
-        output_path = input_path.parent / f"{input_path.stem}.md"
+        return input_path.parent / f"{input_path.stem}.md"
+    return Path(output_path)
+
+
+def _load_input(input_path: Path) -> Optional[str]:
+    """Read the input file, or return None (after reporting it) if it is empty."""
+    text_content = _read_text(input_path)
+    
+    if not text_content.strip():
+        print(f"Error: Input file is empty: {input_path}")
+        return None
+    
+    print(f"Converting {input_path.name} to markdown...")
+    return text_content
+
+
+def _convert_to_file(converter: TextToMarkdownConverter, text_content: str, output_path: Path):
+    """Convert text and write the markdown to output_path."""
+    # Stream Claude's answer straight to disk when the SDK is in use
+    streamed = None
+    if os.environ.get('FORCE_SIMPLE', '0') != '1':
+        streamed = _stream_claude_to_file(converter, text_content, output_path)
+    
+    if streamed:
+        print("✓ AI analysis successful")
     else:
-        output_path = Path(output_path)
+        if streamed is None:
+            markdown_content = _convert_text(converter, text_content)
+        else:
+            # Streaming already reported the failure; don't ask Claude twice
+            print("Using simple text analysis...")
+            markdown_content = converter._simple_text_to_markdown(text_content)
+        
+        # Write the markdown file
+        _write_text(output_path, markdown_content)
     
-    converter = TextToMarkdownConverter()
+    print(f"✓ Markdown saved to: {output_path}")
+
+
+def convert_text_to_markdown(input_path: str, output_path: str = None) -> bool:
+    """Convert text file to markdown format."""
+    input_path = Path(input_path)
+    output_path = _output_path(input_path, output_path)
+    converter = _get_converter()
     
     try:
-        # Read the input file
-        with open(input_path, 'r', encoding='utf-8') as f:
-            text_content = f.read()
-        
-        if not text_content.strip():
-            print(f"Error: Input file is empty: {input_path}")
+        text_content = _load_input(input_path)
+        if text_content is None:
             return False
         
-        print(f"Converting {input_path.name} to markdown...")
-        
-        # Check if we should force simple conversion
-        force_simple = os.environ.get('FORCE_SIMPLE', '0') == '1'
-        
-        if not force_simple:
-            # Try AI analysis first
-            prompt = converter._create_analysis_prompt(text_content)
-            success, result = converter._call_claude(prompt)
-            
-            if success:
-                markdown_content = result
-                print("✓ AI analysis successful")
-            else:
-                # Fallback to simple conversion
-                print(f"AI unavailable: {result}")
-                print("Using simple text analysis...")
-                markdown_content = converter._simple_text_to_markdown(text_content)
-        else:
-            print("Using simple text analysis (forced)...")
-            markdown_content = converter._simple_text_to_markdown(text_content)
+        _convert_to_file(converter, text_content, output_path)
+        return True
         
-        # Write the markdown file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(markdown_content)
+    except Exception as e:
+        print(f"Error during conversion: {e}")
+        return False
+
+
+async def convert_text_to_markdown_async(input_path: str, output_path: str = None) -> bool:
+    """Convert text file to markdown format without blocking the event loop.
+    
+    The output directory is created while the input is read, and the
+    conversion runs in a worker thread.
+    """
+    input_path = Path(input_path)
+    output_path = _output_path(input_path, output_path)
+    converter = _get_converter()
+    
+    try:
+        text_content, _ = await asyncio.gather(
+            asyncio.to_thread(_load_input, input_path),
+            asyncio.to_thread(output_path.parent.mkdir, parents=True, exist_ok=True),
+        )
+        if text_content is None:
+            return False
         
-        print(f"✓ Markdown saved to: {output_path}")
+        await asyncio.to_thread(_convert_to_file, converter, text_content, output_path)
         return True
         
     except Exception as e:
@@ -171,16 +749,190 @@ def convert_text_to_markdown(input_path: str, output_path: str = None) -> bool:
         return False
 
 
+def convert_batch(input_paths: List[str]) -> bool:
+    """Convert several text files, sending them to Claude in as few prompts as possible.
+    
+    Each file's markdown is written next to it. Files converted before are
+    answered from the Claude cache, and batched results are cached per file
+    so a re-run does not send them again. If a batched call fails or
+    its answer is incomplete, the files are sent to Claude one at a time,
+    and any that still fail use the simple conversion.
+    """
+    converter = _get_converter()
+    force_simple = os.environ.get('FORCE_SIMPLE', '0') == '1'
+    all_ok = True
+    
+    jobs = []
+    for input_path in map(Path, input_paths):
+        try:
+            text_content = _read_text(input_path)
+        except Exception as e:
+            print(f"Error reading {input_path}: {e}")
+            all_ok = False
+            continue
+        
+        if not text_content.strip():
+            print(f"Error: Input file is empty: {input_path}")
+            all_ok = False
+            continue
+        
+        output_path = _output_path(input_path, None)
+        cached = None if force_simple else _cache_lookup(converter, _analysis_hash(converter, text_content))
+        if cached is None:
+            jobs.append((input_path, output_path, text_content))
+            continue
+        
+        # Converted on an earlier run, alone or in a batch
+        try:
+            _write_text(output_path, cached)
+            print(f"✓ Markdown saved to: {output_path} (cached)")
+        except Exception as e:
+            print(f"Error during conversion of {input_path.name}: {e}")
+            all_ok = False
+    
+    # One Claude call per batch, plus one per file when a batch falls back
+    batches = _batch_by_size(jobs)
+    if not force_simple:
+        converter.expect_calls(len(batches))
+    
+    try:
+        for batch in batches:
+            names = ", ".join(job[0].name for job in batch)
+            print(f"Converting {names} to markdown...")
+            
+            results = [None] * len(batch)
+            
+            if force_simple:
+                print("Using simple text analysis (forced)...")
+            elif len(batch) > 1:
+                success, result = converter._call_claude(
+                    converter._create_batch_prompt([job[2] for job in batch])
+                )
+                if not success:
+                    print(f"Batched AI call failed: {result}")
+                    print("Converting files individually...")
+                    converter.expect_calls(len(batch))
+                else:
+                    split = _split_batch_response(result, len(batch))
+                    if split is None:
+                        print("Batched AI response incomplete, converting files individually...")
+                        converter.expect_calls(len(batch))
+                    else:
+                        results = split
+                        print("✓ AI analysis successful")
+                        for (_, _, text_content), markdown_content in zip(batch, results):
+                            _cache_store(converter, _analysis_hash(converter, text_content), markdown_content)
+            
+            for (input_path, output_path, text_content), markdown_content in zip(batch, results):
+                try:
+                    if markdown_content is None and not force_simple:
+                        success, result = _call_claude_cached(converter, text_content)
+                        if success:
+                            markdown_content = result
+                        else:
+                            print(f"AI unavailable for {input_path.name}: {result}")
+                    if markdown_content is None:
+                        markdown_content = converter._simple_text_to_markdown(text_content)
+                    
+                    _write_text(output_path, markdown_content)
+                    
+                    print(f"✓ Markdown saved to: {output_path}")
+                except Exception as e:
+                    print(f"Error during conversion of {input_path.name}: {e}")
+                    all_ok = False
+    finally:
+        converter._close_process()
+    
+    return all_ok
+
+
+def convert_many(input_paths: List[str], parallel: int = 8) -> bool:
+    """Convert several text files concurrently, one Claude call per file.
+    
+    Claude calls are I/O bound, so threads overlap their latency. With
+    FORCE_SIMPLE=1 the work is CPU bound and workers are capped at the
+    CPU count.
+    """
+    workers = parallel
+    if os.environ.get('FORCE_SIMPLE', '0') == '1':
+        workers = min(workers, os.cpu_count() or 1)
+    workers = max(1, min(workers, len(input_paths)))
+    
+    # Set up the shared converter and its API client before the workers start
+    converter = _get_converter()
+    converter._get_client()
+    converter.expect_calls(len(input_paths))
+    
+    all_ok = True
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(convert_text_to_markdown, path): path for path in input_paths}
+            for future in as_completed(futures):
+                ok = future.result()
+                all_ok = all_ok and ok
+                print(f"{'✓' if ok else '✗'} {Path(futures[future]).name}")
+    finally:
+        # Cached or empty files never called Claude; drop any process started for them
+        converter._close_process()
+    
+    return all_ok
+
+
+def _expand_input(arg: str) -> List[str]:
+    """Return the files an input argument names.
+    
+    An existing path is used as given, even if it contains glob characters
+    such as brackets; anything else with glob characters is expanded.
+    """
+    if glob.has_magic(arg) and not Path(arg).exists():
+        return sorted(glob.glob(arg))
+    return [arg]
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) < 2:
-        print("Usage: python text_to_markdown.py <input_text_file> [output_markdown_file]")
+    parser = argparse.ArgumentParser(
+        description='Convert plain text files to markdown using Claude AI or simple heuristics.'
+    )
+    parser.add_argument('inputs', nargs='+', metavar='input',
+                        help='Input text files or glob patterns; a single input may be followed by its output file')
+    parser.add_argument('--output', '-o',
+                        help='Output markdown file (single input only; default: <input>.md)')
+    parser.add_argument('--parallel', '-p', type=int, metavar='N',
+                        help='Convert files concurrently with N workers instead of batching them into shared prompts')
+    args = parser.parse_args()
+    
+    inputs = args.inputs
+    output_file = args.output
+    
+    # Original form: <input> <output>. The second argument is an input only if
+    # it names existing, non-markdown files (markdown is what this tool writes)
+    if output_file is None and len(inputs) == 2:
+        second = [Path(path) for path in _expand_input(inputs[1])]
+        if not any(path.is_file() and path.suffix.lower() != '.md' for path in second):
+            inputs, output_file = inputs[:1], inputs[1]
+    
+    input_files = []
+    for arg in inputs:
+        input_files.extend(_expand_input(arg))
+    
+    if not input_files:
+        print("Error: No input files matched")
         sys.exit(1)
     
-    input_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    if output_file is not None:
+        if len(input_files) != 1:
+            print("Error: --output needs exactly one input file")
+            sys.exit(1)
+        success = convert_text_to_markdown(input_files[0], output_file)
+        sys.exit(0 if success else 1)
     
-    success = convert_text_to_markdown(input_file, output_file)
+    if len(input_files) == 1:
+        success = convert_text_to_markdown(input_files[0])
+    elif args.parallel:
+        success = convert_many(input_files, args.parallel)
+    else:
+        success = convert_batch(input_files)
     sys.exit(0 if success else 1)
 
 
@@ -5,13 +5,65 @@ This script checks the structure of the generated document.
 """
 
 import sys
+import zipfile
 from pathlib import Path
-from docx import Document
-from docx.enum.text import WD_ALIGN_PARAGRAPH
+from lxml import etree
+from docx.styles import BabelFish
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+NS = {'w': W_NS}
+W_T = f'{{{W_NS}}}t'
+W_VAL = f'{{{W_NS}}}val'
+W_ASCII = f'{{{W_NS}}}ascii'
+W_STYLE_ID = f'{{{W_NS}}}styleId'
+
+# Front-matter sections as marker -> (section, exact match). verify_document
+# drops each marker once it is found, so later paragraphs are only compared
+# against the markers still missing, whatever order the sections come in
+SECTION_MARKERS = {
+    "The Complete Guide to Spiritual Wisdom": ("title", False),
+    "Dedicated to": ("dedication", False),
+    "Contents": ("contents", True),
+}
+LIST_MARKERS = ("1. The Principle", "1. Presence")
+
+# Don't expand entities from untrusted .docx files (as python-docx's parser)
+XML_PARSER = etree.XMLParser(resolve_entities=False)
+
+
+def read_paragraphs(doc_path):
+    """Return (stripped text, style name, first run font) for each body paragraph.
+    
+    Reads the document XML directly with lxml instead of building
+    python-docx Paragraph and Run objects for a read-only scan.
+    """
+    with zipfile.ZipFile(doc_path) as docx_zip:
+        body = etree.parse(docx_zip.open('word/document.xml'), XML_PARSER).find('w:body', NS)
+        styles = etree.parse(docx_zip.open('word/styles.xml'), XML_PARSER)
+    
+    # Paragraphs refer to styles by ID; resolve each paragraph style's UI
+    # name (as python-docx reports it) once, up front
+    style_names = {
+        style.get(W_STYLE_ID): BabelFish.internal2ui(name.get(W_VAL))
+        for style in styles.getroot().xpath("w:style[@w:type='paragraph']", namespaces=NS)
+        if (name := style.find('w:name', NS)) is not None
+    }
+    
+    paragraphs = []
+    for p in body.iterfind('w:p', NS):
+        text = "".join(t.text or "" for t in p.iter(W_T)).strip()
+        style = p.find('w:pPr/w:pStyle', NS)
+        style_name = style_names.get(style.get(W_VAL)) if style is not None else None
+        # Like run.font.name, only the first run counts even if later runs set a font
+        run = p.find('w:r', NS)
+        fonts = run.find('w:rPr/w:rFonts', NS) if run is not None else None
+        font_name = fonts.get(W_ASCII) if fonts is not None else None
+        paragraphs.append((text, style_name, font_name))
+    return paragraphs
+
 
 def verify_document(doc_path):
     """Verify the document structure and formatting."""
-    doc = Document(doc_path)
     results = []
     
     # Track what we find
@@ -24,45 +76,57 @@ def verify_document(doc_path):
     found_hierarchical_lists = False
     heading_fonts = []
     
-    for i, para in enumerate(doc.paragraphs):
-        text = para.text.strip()
+    paras = read_paragraphs(doc_path)
+    texts = [text for text, _, _ in paras]
+    
+    remaining = dict(SECTION_MARKERS)
+    for i, text in enumerate(texts):
+        section = None
+        for marker, (expected, exact) in remaining.items():
+            if text == marker if exact else marker in text:
+                section = expected
+                del remaining[marker]
+                break
         
         # Check Title
-        if "The Complete Guide to Spiritual Wisdom" in text:
+        if section == "title":
             found_title = True
             # Check if next paragraph is empty (indicating page break)
-            if i + 1 < len(doc.paragraphs) and not doc.paragraphs[i + 1].text.strip():
+            if i + 1 < len(texts) and not texts[i + 1]:
                 title_has_page_break = True
         
         # Check Dedication
-        if "Dedicated to" in text:
+        elif section == "dedication":
             found_dedication = True
             # Check for page break after
-            if i + 1 < len(doc.paragraphs) and not doc.paragraphs[i + 1].text.strip():
+            if i + 1 < len(texts) and not texts[i + 1]:
                 dedication_has_page_break = True
         
         # Check Contents
-        if text == "Contents":
+        elif section == "contents":
             found_contents = True
             # Check for page break after contents section
             # Look for several paragraphs ahead since contents has items
-            for j in range(i + 1, min(i + 10, len(doc.paragraphs))):
-                if "Chapter 1" in doc.paragraphs[j].text:
+            for j, following in enumerate(texts[i + 1:i + 10], i + 1):
+                if "Chapter 1" in following:
                     # Check if there's empty paragraph before Chapter 1
-                    if j > 0 and not doc.paragraphs[j - 1].text.strip():
+                    if not texts[j - 1]:
                         contents_has_page_break = True
                     break
         
-        # Check heading fonts
-        if para.style and para.style.name and 'Heading' in para.style.name:
-            if para.runs:
-                font_name = para.runs[0].font.name
-                if font_name:
-                    heading_fonts.append(f"{para.style.name}: {font_name}")
-        
         # Check for hierarchical lists (numbered items)
-        if text.startswith("1. The Principle") or text.startswith("1. Presence"):
+        if text.startswith(LIST_MARKERS):
             found_hierarchical_lists = True
+        
+        # Nothing left to find once every marker has been seen
+        if all((found_title, title_has_page_break, found_dedication, dedication_has_page_break,
+                found_contents, contents_has_page_break, found_hierarchical_lists)):
+            break
+    
+    # Check heading fonts (needs every heading, so it is a separate pass)
+    for _, style_name, font_name in paras:
+        if font_name and style_name and style_name.startswith('Heading'):
+            heading_fonts.append(f"{style_name}: {font_name}")
     
     # Print results
     print(f"\nVerification Results for: {doc_path.name}")